@@ -0,0 +1,82 @@
+"""
+Compare latency of CacheService operations on the in-memory and Redis
+cache backends. Redis is skipped when it is not reachable.
+
+Run from the project root:
+    python -m benchmarks.cache_backend_benchmark
+"""
+import asyncio
+import time
+
+from redis.exceptions import RedisError
+
+from benchmarks.cache_codec_benchmark import build_catalog
+from src.api.response_models.menu_response import MenuSummaryResponse
+from src.core.settings import settings
+from src.db.redis_pool import close_redis_pool, get_redis
+from src.services.cache_backends import (
+    AbstractCacheBackend,
+    MemoryCacheBackend,
+    RedisCacheBackend,
+)
+from src.services.cache_keys import menu_tree_key
+from src.services.cache_service import CacheService
+
+CATALOG_SIZES = ((10, 10, 10), (50, 10, 20))
+REPEAT = 50
+
+
+async def measure(operation) -> float:
+    """Get average duration of the operation in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        await operation()
+    return (time.perf_counter() - started) / REPEAT * 1000
+
+
+async def run(backend: AbstractCacheBackend, catalog: list) -> dict:
+    service = CacheService()
+    service.backend = backend
+    service.local_cache_enabled = False
+    trees = {menu_tree_key(menu.id): menu for menu in catalog}
+    keys = list(trees)
+    results = {
+        'set_many': await measure(
+            lambda: service.set_many(trees, MenuSummaryResponse)
+        ),
+        'get_cache': await measure(lambda: service.get_cache(keys[0])),
+        'get_many': await measure(lambda: service.get_many(keys)),
+        'invalidate': await measure(
+            lambda: service.invalidate_cache_for_menu(catalog[0].id)
+        ),
+    }
+    await backend.flush()
+    return results
+
+
+async def main() -> None:
+    backends: dict[str, AbstractCacheBackend] = {
+        'memory': MemoryCacheBackend(
+            max_entries=settings.CACHE_MEMORY_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MEMORY_MAX_BYTES,
+        ),
+    }
+    try:
+        await get_redis().ping()
+        backends['redis'] = RedisCacheBackend()
+    except (RedisError, OSError):
+        print('Redis is not reachable, only memory backend is measured')
+    operations = ('set_many', 'get_cache', 'get_many', 'invalidate')
+    print(f'{"catalog":>12} {"backend":>8}' + ''.join(f'{name:>12}' for name in operations))
+    for menus, submenus, dishes in CATALOG_SIZES:
+        catalog = build_catalog(menus, submenus, dishes)
+        name = f'{menus}x{submenus}x{dishes}'
+        for backend_name, backend in backends.items():
+            results = await run(backend, catalog)
+            timings = ''.join(f'{results[operation]:>12.3f}' for operation in operations)
+            print(f'{name:>12} {backend_name:>8}{timings}')
+    await close_redis_pool()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+Compare cache payload size and encode/decode time of the schema-aware
+codec against pickling ORM objects and pydantic responses.
+
+Run from the project root:
+    python -m benchmarks.cache_codec_benchmark
+"""
+import pickle
+import timeit
+import uuid
+from decimal import Decimal
+
+from src.api.response_models.menu_response import MenuSummaryResponse
+from src.db.models import Dish, Menu, Submenu
+from src.services import cache_codec
+
+CATALOG_SIZES = ((1, 3, 5), (10, 10, 10), (50, 10, 20))
+REPEAT = 20
+
+
+def build_catalog(menus: int, submenus: int, dishes: int) -> list[Menu]:
+    """Build detached ORM tree like get_full_menus_info_db returns."""
+    catalog = []
+    for menu_number in range(menus):
+        menu = Menu(
+            id=uuid.uuid4(),
+            title=f'Menu {menu_number}',
+            description='Menu description',
+        )
+        for submenu_number in range(submenus):
+            submenu = Submenu(
+                id=uuid.uuid4(),
+                title=f'Submenu {menu_number}-{submenu_number}',
+                description='Submenu description',
+                menu_id=menu.id,
+            )
+            submenu.dishes = [
+                Dish(
+                    id=uuid.uuid4(),
+                    title=f'Dish {menu_number}-{submenu_number}-{number}',
+                    description='Dish description',
+                    price=Decimal('123.45'),
+                    submenu_id=submenu.id,
+                )
+                for number in range(dishes)
+            ]
+            menu.submenus.append(submenu)
+        catalog.append(menu)
+    return catalog
+
+
+def measure(encode, decode) -> tuple[int, float, float]:
+    payload = encode()
+    encode_time = timeit.timeit(encode, number=REPEAT) / REPEAT
+    decode_time = timeit.timeit(lambda: decode(payload), number=REPEAT) / REPEAT
+    return len(payload), encode_time * 1000, decode_time * 1000
+
+
+def main() -> None:
+    print(f'{"catalog":>14} {"path":>16} {"bytes":>10} {"encode ms":>10} {"decode ms":>10}')
+    for menus, submenus, dishes in CATALOG_SIZES:
+        catalog = build_catalog(menus, submenus, dishes)
+        responses = [MenuSummaryResponse.from_orm(menu) for menu in catalog]
+        paths = {
+            'pickle orm': (lambda: pickle.dumps(catalog), pickle.loads),
+            'pickle pydantic': (lambda: pickle.dumps(responses), pickle.loads),
+            'codec': (
+                lambda: cache_codec.encode(catalog, MenuSummaryResponse),
+                cache_codec.decode,
+            ),
+        }
+        name = f'{menus}x{submenus}x{dishes}'
+        for path, (encode, decode) in paths.items():
+            size, encode_ms, decode_ms = measure(encode, decode)
+            print(f'{name:>14} {path:>16} {size:>10} {encode_ms:>10.3f} {decode_ms:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare size and encode/decode time of cache payloads of full menus
+tree and dishes list without compression and with zlib levels. When
+Redis from settings is reachable, SET/GET round trip and memory usage
+of the key are measured as well.
+
+Run from the project root:
+    python -m benchmarks.cache_compression_benchmark
+"""
+import asyncio
+import time
+import timeit
+
+from redis.exceptions import RedisError
+
+from benchmarks.cache_codec_benchmark import build_catalog
+from src.api.response_models.dish_response import DishResponse
+from src.api.response_models.menu_response import MenuSummaryResponse
+from src.db.redis_pool import close_redis_pool, get_redis
+from src.services import cache_codec
+
+CATALOG_SIZES = ((10, 10, 10), (50, 10, 20), (200, 10, 20))
+# None means no compression.
+LEVELS = (None, 1, 6, 9)
+REPEAT = 20
+BENCHMARK_KEY = 'benchmark:compression'
+
+
+def measure(value, model, level) -> tuple[bytes, float, float]:
+    threshold, level = (0, 0) if level is None else (1, level)
+    payload = cache_codec.encode(value, model, threshold, level)
+    encode_time = timeit.timeit(
+        lambda: cache_codec.encode(value, model, threshold, level),
+        number=REPEAT,
+    )
+    decode_time = timeit.timeit(
+        lambda: cache_codec.decode(payload), number=REPEAT
+    )
+    return payload, encode_time / REPEAT * 1000, decode_time / REPEAT * 1000
+
+
+async def measure_redis(payload: bytes) -> tuple[float, int] | None:
+    """Get SET+GET round trip in ms and memory usage of payload in Redis."""
+    redis = get_redis()
+    try:
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            await redis.set(BENCHMARK_KEY, payload)
+            await redis.get(BENCHMARK_KEY)
+        round_trip = (time.perf_counter() - started) / REPEAT * 1000
+        memory = await redis.memory_usage(BENCHMARK_KEY)
+        await redis.delete(BENCHMARK_KEY)
+    except (RedisError, OSError):
+        return None
+    return round_trip, memory
+
+
+async def main() -> None:
+    print(
+        f'{"catalog":>12} {"payload":>12} {"level":>5} {"bytes":>10} '
+        f'{"encode ms":>10} {"decode ms":>10} {"redis ms":>9} {"memory":>10}'
+    )
+    for menus, submenus, dishes in CATALOG_SIZES:
+        catalog = build_catalog(menus, submenus, dishes)
+        all_dishes = [
+            dish
+            for menu in catalog
+            for submenu in menu.submenus
+            for dish in submenu.dishes
+        ]
+        payloads = {
+            'menus tree': (catalog, MenuSummaryResponse),
+            'dishes list': (all_dishes, DishResponse),
+        }
+        name = f'{menus}x{submenus}x{dishes}'
+        for payload_name, (value, model) in payloads.items():
+            for level in LEVELS:
+                payload, encode_ms, decode_ms = measure(value, model, level)
+                redis_stats = await measure_redis(payload)
+                redis_ms, memory = (
+                    (f'{redis_stats[0]:.3f}', str(redis_stats[1]))
+                    if redis_stats
+                    else ('-', '-')
+                )
+                print(
+                    f'{name:>12} {payload_name:>12} {str(level or "-"):>5} '
+                    f'{len(payload):>10} {encode_ms:>10.3f} {decode_ms:>10.3f} '
+                    f'{redis_ms:>9} {memory:>10}'
+                )
+    await close_redis_pool()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Compare /menus/menus_info/ built from ORM objects with the JSON built by
+the database with json_agg. Tables of the test database are recreated
+and filled with catalogs of 10k and 100k dishes.
+
+Run from the project root:
+    python -m benchmarks.menus_info_benchmark
+"""
+import asyncio
+import json
+import time
+import uuid
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.response_models.menu_response import MenuSummaryResponse
+from src.core.settings import settings
+from src.db.models import Base, Dish, Menu, Submenu
+from src.repositories.menus_repository import MenuRepository
+
+# Menus, submenus of a menu and dishes of a submenu.
+CATALOG_SIZES = ((10, 10, 100), (100, 10, 100))
+REPEAT = 5
+
+
+async def fill_catalog(
+    session: AsyncSession, menus: int, submenus: int, dishes: int
+) -> None:
+    menu_rows, submenu_rows, dish_rows = [], [], []
+    for menu_number in range(menus):
+        menu_id = uuid.uuid4()
+        menu_rows.append(
+            {
+                'id': menu_id,
+                'title': f'Menu {menu_number}',
+                'description': 'Menu description',
+            }
+        )
+        for submenu_number in range(submenus):
+            submenu_id = uuid.uuid4()
+            submenu_rows.append(
+                {
+                    'id': submenu_id,
+                    'title': f'Submenu {menu_number}-{submenu_number}',
+                    'description': 'Submenu description',
+                    'menu_id': menu_id,
+                }
+            )
+            dish_rows.extend(
+                {
+                    'id': uuid.uuid4(),
+                    'title': f'Dish {menu_number}-{submenu_number}-{number}',
+                    'description': 'Dish description',
+                    'price': Decimal('12.50'),
+                    'submenu_id': submenu_id,
+                }
+                for number in range(dishes)
+            )
+    await session.execute(insert(Menu), menu_rows)
+    await session.execute(insert(Submenu), submenu_rows)
+    for start in range(0, len(dish_rows), 10_000):
+        await session.execute(insert(Dish), dish_rows[start:start + 10_000])
+    await session.commit()
+
+
+async def orm_menus_info(session: AsyncSession) -> bytes:
+    """Load ORM tree and serialize it like the router does."""
+    menus = await MenuRepository(session).get_full_menus_info_db()
+    responses = [MenuSummaryResponse.from_orm(menu) for menu in menus]
+    return json.dumps(jsonable_encoder(responses)).encode()
+
+
+async def json_agg_menus_info(session: AsyncSession) -> bytes:
+    """Read JSON built by the database."""
+    repository = MenuRepository(session)
+    return b''.join(
+        [chunk async for chunk in repository.stream_full_menus_json_db()]
+    )
+
+
+async def measure(session_maker: sessionmaker, read) -> tuple[float, int]:
+    """Get average duration in milliseconds and size of the response."""
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        async with session_maker() as session:
+            body = await read(session)
+    return (time.perf_counter() - started) / REPEAT * 1000, len(body)
+
+
+async def main() -> None:
+    engine = create_async_engine(settings.database_test_url)
+    session_maker = sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )
+    print(f'{"catalog":>12} {"dishes":>8} {"path":>9} {"ms":>10} {"bytes":>10}')
+    for menus, submenus, dishes in CATALOG_SIZES:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_maker() as session:
+            await fill_catalog(session, menus, submenus, dishes)
+        name = f'{menus}x{submenus}x{dishes}'
+        for path, read in (
+            ('orm', orm_menus_info),
+            ('json_agg', json_agg_menus_info),
+        ):
+            duration, size = await measure(session_maker, read)
+            print(
+                f'{name:>12} {menus * submenus * dishes:>8} {path:>9} '
+                f'{duration:>10.1f} {size:>10}'
+            )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,10 +1,27 @@
 from fastapi import FastAPI
 
+from src.api.response_cache import ResponseCacheMiddleware
+from src.api.routers.cache_router import cache_router
 from src.api.routers.dishes_router import dishes_router
 from src.api.routers.menus_router import menu_router
 from src.api.routers.submenus_router import submenus_router
 from src.api.routers.service_router import parser_router
 from src.core.settings import settings
+from src.db.redis_pool import open_redis_pool
+from src.services.cache_backends import close_cache_backend
+from src.services.local_cache import (
+    start_invalidation_listener,
+    stop_invalidation_listener,
+)
+from src.tasks.cache_warmup import (
+    start_cache_rebuilder,
+    stop_cache_rebuilder,
+    warm_up_cache_on_startup,
+)
+from src.tasks.catalog_view import (
+    start_catalog_view_refresher,
+    stop_catalog_view_refresher,
+)
 
 
 def create_app() -> FastAPI:
@@ -13,5 +30,25 @@ def create_app() -> FastAPI:
     app.include_router(submenus_router, prefix='/api/v1')
     app.include_router(dishes_router, prefix='/api/v1')
     app.include_router(parser_router, prefix='/api/v1')
+    app.include_router(cache_router, prefix='/api/v1')
+    if settings.CACHE_RESPONSES_ENABLED:
+        app.add_middleware(
+            ResponseCacheMiddleware,
+            prefix='/api/v1/menus',
+            write_paths=(
+                '/api/v1/update_from_excel',
+                '/api/v1/cache/counters/reconcile',
+            ),
+        )
+    app.add_event_handler('startup', open_redis_pool)
+    app.add_event_handler('startup', start_invalidation_listener)
+    app.add_event_handler('startup', warm_up_cache_on_startup)
+    app.add_event_handler('startup', start_cache_rebuilder)
+    app.add_event_handler('startup', start_catalog_view_refresher)
+    app.add_event_handler('shutdown', stop_catalog_view_refresher)
+    app.add_event_handler('shutdown', stop_cache_rebuilder)
+    app.add_event_handler('shutdown', stop_invalidation_listener)
+    # The cache is shared by workers and releases, so it is kept on shutdown.
+    app.add_event_handler('shutdown', close_cache_backend)
 
     return app
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import Query, Response
+from pydantic import UUID4
+
+from src.core.settings import settings
+
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+class PageRequest:
+    """
+    Query parameters of keyset pagination of lists ordered by id. Lists
+    are not paginated unless limit or cursor is given.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(
+            None,
+            ge=1,
+            le=settings.PAGINATION_MAX_LIMIT,
+            description='Maximum number of items on the page',
+        ),
+        cursor: Optional[UUID4] = Query(
+            None,
+            description=f'Value of the {NEXT_CURSOR_HEADER} header of the '
+            'previous page',
+        ),
+    ) -> None:
+        self.limit = limit or settings.PAGINATION_DEFAULT_LIMIT
+        self.cursor = cursor
+        self.requested = limit is not None or cursor is not None
+
+    @staticmethod
+    def set_next_cursor(response: Response, next_cursor: UUID4 | None) -> None:
+        """Tell the client where the next page starts, if there is one."""
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = str(next_cursor)
@@ -0,0 +1,163 @@
+import re
+from http import HTTPStatus
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.services.cache_backends import CacheUnavailableError
+from src.services.cache_codec import CachedResponse
+from src.services.cache_keys import (
+    RESPONSES_LISTS_TAG,
+    RESPONSES_TAG,
+    menu_responses_tag,
+)
+from src.services.cache_policies import get_cache_policies
+from src.services.cache_service import CacheService
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache of serialized responses of GET requests under the prefix. Hits
+    are sent without routing, dependencies and validation of responses.
+    Responses are keyed by generations bumped after write requests under
+    the prefix and to write_paths, and again after background tasks of
+    the write, which refresh the services cache. Services bump them for
+    the menu owning written objects, which may be not the menu of URL.
+    """
+
+    def __init__(
+        self, app: ASGIApp, prefix: str, write_paths: tuple[str, ...] = ()
+    ) -> None:
+        self.app = app
+        self.prefix = prefix
+        self.write_paths = write_paths
+        # Other paths under the prefix, like the full menus, are lists.
+        self._menu_path = re.compile(
+            f'^{re.escape(prefix)}/(?P<menu_id>[0-9a-fA-F-]{{36}})(/|$)'
+        )
+        self._policy = get_cache_policies()['response']
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+        elif scope['method'] == 'GET' and scope['path'].startswith(
+            self.prefix
+        ):
+            # Backend of the service is replaced after it is closed.
+            await self._cached(CacheService(), scope, receive, send)
+        elif scope['method'] not in SAFE_METHODS and self._changes_data(
+            scope['path']
+        ):
+            await self._write(CacheService(), scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    def _changes_data(self, path: str) -> bool:
+        """Check if write to the path changes data of cached responses."""
+        return path.startswith(self.prefix) or path in self.write_paths
+
+    def _read_tags(self, path: str) -> list[str]:
+        """Get generation tags the response of the path depends on."""
+        match = self._menu_path.match(path)
+        if match is None:
+            return [RESPONSES_TAG, RESPONSES_LISTS_TAG]
+        return [RESPONSES_TAG, menu_responses_tag(match['menu_id'])]
+
+    def _write_tags(self, path: str) -> list[str]:
+        """Get generation tags of responses changed by write to the path."""
+        if not path.startswith(self.prefix):
+            return [RESPONSES_TAG]
+        match = self._menu_path.match(path)
+        if match is None:
+            return [RESPONSES_LISTS_TAG]
+        return [menu_responses_tag(match['menu_id']), RESPONSES_LISTS_TAG]
+
+    async def _cached(
+        self,
+        cache_service: CacheService,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        path = scope['path']
+        if scope['query_string']:
+            path = f"{path}?{scope['query_string'].decode('latin-1')}"
+        tags = self._read_tags(scope['path'])
+        try:
+            generations = await cache_service.get_generations(set(tags))
+        except CacheUnavailableError:
+            await self.app(scope, receive, send)
+            return
+        key = self._policy.key(path=path) + ''.join(
+            f'@{generations[tag]}' for tag in tags
+        )
+        cached = await cache_service.get_cache(key)
+        if isinstance(cached, CachedResponse):
+            await self._send_cached(cached, send)
+            return
+        start: Message = {}
+        body = []
+
+        async def send_and_collect(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                start.update(message)
+            elif message['type'] == 'http.response.body':
+                body.append(message.get('body', b''))
+            await send(message)
+
+        await self.app(scope, receive, send_and_collect)
+        if start.get('status') == HTTPStatus.OK:
+            headers = [
+                (name.decode('latin-1'), value.decode('latin-1'))
+                for name, value in start.get('headers', [])
+            ]
+            await cache_service.set_cache(
+                key, CachedResponse(HTTPStatus.OK, headers, b''.join(body))
+            )
+
+    @staticmethod
+    async def _send_cached(cached: CachedResponse, send: Send) -> None:
+        headers = [
+            (name.encode('latin-1'), value.encode('latin-1'))
+            for name, value in cached.headers
+        ]
+        headers.append((b'x-cache', b'HIT'))
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': cached.status,
+                'headers': headers,
+            }
+        )
+        await send({'type': 'http.response.body', 'body': cached.body})
+
+    async def _write(
+        self,
+        cache_service: CacheService,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """
+        Bump generations before the client gets the response of write,
+        and again after its background tasks. Responses cached between
+        them may be built from services cache the tasks refresh.
+        """
+
+        async def bump() -> None:
+            for tag in self._write_tags(scope['path']):
+                await cache_service.bump_generation(tag)
+
+        async def bump_and_send(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                await bump()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, bump_and_send)
+        finally:
+            # Failed write could change data before it failed.
+            await bump()
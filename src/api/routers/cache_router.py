@@ -0,0 +1,68 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from src.db.redis_pool import get_redis_pool_stats
+from src.services.cache_metrics import cache_metrics
+from src.services.menus_service import MenuService
+from src.tasks.cache_warmup import warm_up_cache
+
+cache_router = APIRouter(prefix='/cache', tags=['Cache'])
+
+
+@cache_router.get(
+    '/pool',
+    summary='Get Redis connection pool usage',
+    description='Returns size and usage of the process-wide Redis connection pool '
+    'of the current worker.',
+    response_description='Redis connection pool statistics',
+)
+async def get_pool_stats() -> dict[str, int]:
+    return get_redis_pool_stats()
+
+
+@cache_router.get(
+    '/metrics',
+    summary='Get cache metrics',
+    description='Returns cache hits, misses, bytes read and written, serialization '
+    'time and cache backend latency histograms of the current worker, grouped by key family.',
+    response_description='Cache metrics by key family',
+)
+async def get_cache_metrics() -> dict[str, dict[str, Any]]:
+    return cache_metrics.snapshot()
+
+
+@cache_router.delete(
+    '/metrics',
+    summary='Reset cache metrics',
+    description='Forgets cache metrics collected by the current worker.',
+    response_description='Metrics were reset',
+)
+async def reset_cache_metrics() -> dict[str, str]:
+    cache_metrics.reset()
+    return {'message': 'Cache metrics were reset'}
+
+
+@cache_router.post(
+    '/warmup',
+    summary='Warm up the cache',
+    description='Fills cache of the list of menus, full menus tree and lists of '
+    'submenus and dishes of every menu.',
+    response_description='Number of warmed menus and lists',
+)
+async def warm_up() -> dict[str, int]:
+    return await warm_up_cache()
+
+
+@cache_router.post(
+    '/counters/reconcile',
+    summary='Recount submenus and dishes counters',
+    description='Fixes submenus_count and dishes_count columns of all menus and '
+    'submenus kept by database triggers, then drops caches of menus and lists '
+    'holding the old counts.',
+    response_description='Number of reconciled menus and submenus',
+)
+async def reconcile_counters(
+    menu_service: MenuService = Depends(),
+) -> dict[str, int]:
+    return await menu_service.reconcile_counters()
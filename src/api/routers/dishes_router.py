@@ -1,11 +1,12 @@
 from http import HTTPStatus
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Response
 from fastapi.responses import JSONResponse
 from fastapi_restful.cbv import cbv
 from pydantic import UUID4
 
+from src.api.request_models.page_request import PageRequest
 from src.api.request_models.request_base import DishRequest
 from src.api.response_models.dish_response import DishResponse
 from src.services.dishes_service import DishService
@@ -101,13 +102,25 @@ class DishCBV:
     @dishes_router.get(
         '/',
         summary='Get a list of available dishes',
-        description='To retrieve dishes, send a GET request to the "dishes" URL path.',
+        description='To retrieve dishes, send a GET request to the "dishes" URL path. '
+        'With limit or cursor the dishes are returned by pages ordered by id, '
+        'the cursor of the next page is in the X-Next-Cursor header.',
         response_model=list[DishResponse],
         status_code=HTTPStatus.OK,
         response_description='Returns a list of dishes,'
         ' or an empty list if no dishes have been created',
     )
     async def get_dishes_router(
-        self, menu_id: UUID4, submenu_id: UUID4
+        self,
+        menu_id: UUID4,
+        submenu_id: UUID4,
+        response: Response,
+        page: PageRequest = Depends(),
     ) -> list[DishResponse]:
-        return await self.__dish_service.get_dishes(menu_id, submenu_id)
+        if not page.requested:
+            return await self.__dish_service.get_dishes(menu_id, submenu_id)
+        dishes, next_cursor = await self.__dish_service.get_dishes_page(
+            menu_id, submenu_id, page.limit, page.cursor
+        )
+        page.set_next_cursor(response, next_cursor)
+        return dishes
@@ -1,12 +1,14 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, Path
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Path, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi_restful.cbv import cbv
 from pydantic import UUID4
 
+from src.api.request_models.page_request import PageRequest
 from src.api.request_models.request_base import MenuRequest
 from src.api.response_models.menu_response import MenuInfResponse, MenuSummaryResponse
+from src.core.settings import settings
 from src.services.menus_service import MenuService
 
 menu_router = APIRouter(prefix='/menus', tags=['Menu'])
@@ -79,13 +81,23 @@ class MenuCBV:
     @menu_router.get(
         '/',
         summary='Get a list of available menus',
-        description='To retrieve menus, send a GET request to the "menus" URL path.',
+        description='To retrieve menus, send a GET request to the "menus" URL path. '
+        'With limit or cursor the menus are returned by pages ordered by id, '
+        'the cursor of the next page is in the X-Next-Cursor header.',
         response_model=list[MenuInfResponse],
         status_code=HTTPStatus.OK,
         response_description='Returns a list of menus, or an empty list if no menus have been created',
     )
-    async def get_menus_router(self) -> list[MenuInfResponse]:
-        return await self.__menu_service.get_menus()
+    async def get_menus_router(
+        self, response: Response, page: PageRequest = Depends()
+    ) -> list[MenuInfResponse]:
+        if not page.requested:
+            return await self.__menu_service.get_menus()
+        menus, next_cursor = await self.__menu_service.get_menus_page(
+            page.limit, page.cursor
+        )
+        page.set_next_cursor(response, next_cursor)
+        return menus
 
     @menu_router.get(
         '/menus_info/',
@@ -96,5 +108,12 @@ class MenuCBV:
         status_code=HTTPStatus.OK,
         response_description='Summary_menus_info',
     )
-    async def get_all_info_router(self) -> list[MenuSummaryResponse]:
+    async def get_all_info_router(
+        self,
+    ) -> list[MenuSummaryResponse] | StreamingResponse:
+        if settings.MENUS_INFO_MODE == 'json_agg':
+            return StreamingResponse(
+                self.__menu_service.full_menus_json(),
+                media_type='application/json',
+            )
         return await self.__menu_service.full_menus()
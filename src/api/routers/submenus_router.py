@@ -1,10 +1,11 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Response
 from fastapi.responses import JSONResponse
 from fastapi_restful.cbv import cbv
 from pydantic import UUID4
 
+from src.api.request_models.page_request import PageRequest
 from src.api.request_models.request_base import MenuRequest
 from src.api.response_models.submenu_response import SubmenuInfoResponse
 from src.services.submenus_service import SubmenuService
@@ -92,11 +93,25 @@ class SubmenuCBV:
     @submenus_router.get(
         '/',
         summary='Get a list of available submenus',
-        description='To retrieve submenus, send a GET request to the "submenus" URL path.',
+        description='To retrieve submenus, send a GET request to the "submenus" URL path. '
+        'With limit or cursor the submenus are returned by pages ordered by id, '
+        'the cursor of the next page is in the X-Next-Cursor header.',
         response_model=list[SubmenuInfoResponse],
         response_description='Returns a list of submenus, or an empty list if no submenus have been created',
     )
     async def get_submenus_router(
-        self, menu_id: UUID4
+        self,
+        menu_id: UUID4,
+        response: Response,
+        page: PageRequest = Depends(),
     ) -> list[SubmenuInfoResponse]:
-        return await self.__submenu_service.get_submenus(menu_id)
+        if not page.requested:
+            return await self.__submenu_service.get_submenus(menu_id)
+        (
+            submenus,
+            next_cursor,
+        ) = await self.__submenu_service.get_submenus_page(
+            menu_id, page.limit, page.cursor
+        )
+        page.set_next_cursor(response, next_cursor)
+        return submenus
@@ -32,3 +32,16 @@ async def parse_excel_task() -> dict[str, str] | str | None:
 def sync_excel_task() -> None:
     loop = asyncio.get_event_loop()
     loop.run_until_complete(parse_excel_task())
+
+
+async def warm_up_cache_task() -> dict[str, int] | str | None:
+    async with httpx.AsyncClient() as client:
+        celery_logger.info('warm_up_cache')
+        response = await client.post('http://resto_back:8000/api/v1/cache/warmup')
+        return response.json()
+
+
+@app_celery.task(name='warm_up_cache')
+def warm_up_task() -> None:
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(warm_up_cache_task())
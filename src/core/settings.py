@@ -1,6 +1,7 @@
 from functools import cache
+from typing import Literal
 
-from pydantic import BaseSettings
+from pydantic import BaseSettings, validator
 
 
 class Settings(BaseSettings):
@@ -22,10 +23,62 @@ class Settings(BaseSettings):
     REDIS_PORT: int
     REDIS_DB = int
     REDIS_CACHE_LIFETIME: int
+    REDIS_CACHE_SOFT_LIFETIME: int | None = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_CLUSTER: bool = False
+    CACHE_BACKEND: Literal['redis', 'memory'] = 'redis'
+    CACHE_CALL_TIMEOUT: float = 0.1
+    CACHE_BREAKER_FAILURE_THRESHOLD: int = 5
+    CACHE_BREAKER_RECOVERY_TIMEOUT: float = 10.0
+    CACHE_NAMESPACE: str = 'resto'
+    CACHE_VERSION: str = '1'
+    CACHE_MEMORY_MAX_ENTRIES: int = 100_000
+    CACHE_MEMORY_MAX_BYTES: int = 256 * 1024 * 1024
+    CACHE_L1_ENABLED: bool = False
+    CACHE_L1_MAX_ENTRIES: int = 1024
+    CACHE_L1_MAX_BYTES: int = 32 * 1024 * 1024
+    CACHE_L1_TTL: float = 30.0
+    CACHE_INVALIDATION_CHANNEL: str = 'cache-invalidation'
+    CACHE_INVALIDATION_MODE: Literal['tags', 'generations'] = 'tags'
+    CACHE_NOT_FOUND_LIFETIME: int = 10
+    CACHE_COMPRESSION_THRESHOLD: int = 16 * 1024
+    CACHE_COMPRESSION_LEVEL: int = 1
+    CACHE_WARMUP_ON_STARTUP: bool = False
+    CACHE_WARMUP_CONCURRENCY: int = 4
+    CACHE_AGGREGATES_MODE: Literal['invalidate', 'rebuild'] = 'invalidate'
+    CACHE_REBUILD_DELAY: float = 0.5
+    CACHE_REBUILD_MAX_DELAY: float = 5.0
+    CACHE_POLICIES: dict[str, dict[str, int]] = {}
+    CACHE_RESPONSES_ENABLED: bool = False
+    CACHE_LOCK_TIMEOUT: float = 5.0
+    CACHE_LOCK_WAIT_TIMEOUT: float = 5.0
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05
+    MENUS_INFO_MODE: Literal['orm', 'json_agg'] = 'orm'
+    CATALOG_VIEW_ENABLED: bool = False
+    CATALOG_VIEW_REFRESH_DELAY: float = 1.0
+    CATALOG_VIEW_REFRESH_MAX_DELAY: float = 30.0
+    PAGINATION_DEFAULT_LIMIT: int = 100
+    PAGINATION_MAX_LIMIT: int = 1000
     RABBITMQ_DEFAULT_USER: str
     RABBMQHOST: str
     RABBITMQ_DEFAULT_PASS: str
 
+    @validator('REDIS_CACHE_SOFT_LIFETIME')
+    def soft_lifetime_less_than_lifetime(
+        cls, value: int | None, values: dict
+    ) -> int | None:
+        """Soft lifetime must end before the cache entry expires."""
+        lifetime = values.get('REDIS_CACHE_LIFETIME')
+        if value is not None and lifetime is not None and value >= lifetime:
+            raise ValueError(
+                'REDIS_CACHE_SOFT_LIFETIME must be less than '
+                'REDIS_CACHE_LIFETIME'
+            )
+        return value
+
     @property
     def database_url(self) -> str:
         """Get link for DB connection."""
@@ -0,0 +1,78 @@
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TEXT, UUID
+
+# Materialized view with one row per menu, submenu and dish, with counts
+# kept by the counter triggers. Reads of lists and trees take rows of
+# the view instead of joining the tables. Rows are unique by id, which
+# concurrent refresh needs.
+CREATE_CATALOG_VIEW = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS catalog_view AS
+SELECT
+    menus.id,
+    'menu' AS kind,
+    menus.id AS menu_id,
+    NULL::uuid AS submenu_id,
+    menus.title,
+    menus.description,
+    NULL::numeric(7, 2) AS price,
+    menus.submenus_count,
+    menus.dishes_count
+FROM menus
+UNION ALL
+SELECT
+    submenus.id,
+    'submenu',
+    submenus.menu_id,
+    submenus.id,
+    submenus.title,
+    submenus.description,
+    NULL,
+    NULL,
+    submenus.dishes_count
+FROM submenus
+UNION ALL
+SELECT
+    dishes.id,
+    'dish',
+    submenus.menu_id,
+    dishes.submenu_id,
+    dishes.title,
+    dishes.description,
+    dishes.price,
+    NULL,
+    NULL
+FROM dishes JOIN submenus ON submenus.id = dishes.submenu_id
+"""
+
+CREATE_CATALOG_VIEW_INDEXES = (
+    'CREATE UNIQUE INDEX IF NOT EXISTS ix_catalog_view_id ON catalog_view (id)',
+    'CREATE INDEX IF NOT EXISTS ix_catalog_view_kind_menu_id '
+    'ON catalog_view (kind, menu_id)',
+)
+
+# Trees of given menus are read by menu id of all their rows.
+CREATE_CATALOG_VIEW_MENU_INDEX = (
+    'CREATE INDEX IF NOT EXISTS ix_catalog_view_menu_id '
+    'ON catalog_view (menu_id)'
+)
+DROP_CATALOG_VIEW_MENU_INDEX = 'DROP INDEX IF EXISTS ix_catalog_view_menu_id'
+
+DROP_CATALOG_VIEW = 'DROP MATERIALIZED VIEW IF EXISTS catalog_view'
+
+# Readers are not blocked while the view is refreshed.
+REFRESH_CATALOG_VIEW = 'REFRESH MATERIALIZED VIEW CONCURRENTLY catalog_view'
+
+# Not part of the models metadata, so create_all does not make a table.
+catalog_view = sa.Table(
+    'catalog_view',
+    sa.MetaData(),
+    sa.Column('id', UUID(as_uuid=True), primary_key=True),
+    sa.Column('kind', TEXT),
+    sa.Column('menu_id', UUID(as_uuid=True)),
+    sa.Column('submenu_id', UUID(as_uuid=True)),
+    sa.Column('title', TEXT),
+    sa.Column('description', TEXT),
+    sa.Column('price', sa.Numeric(precision=7, scale=2)),
+    sa.Column('submenus_count', sa.Integer),
+    sa.Column('dishes_count', sa.Integer),
+)
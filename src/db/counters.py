@@ -0,0 +1,113 @@
+# Triggers keeping submenus_count and dishes_count columns of menus and
+# submenus equal to the number of their rows. Every statement is executed
+# separately, asyncpg can not prepare several statements at once.
+
+# Moves one dish between counters of submenus and their menus.
+COUNT_DISHES_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_dishes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.submenu_id = NEW.submenu_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE submenus SET dishes_count = dishes_count - 1
+        WHERE id = OLD.submenu_id;
+        UPDATE menus SET dishes_count = dishes_count - 1
+        WHERE id = (SELECT menu_id FROM submenus WHERE id = OLD.submenu_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE submenus SET dishes_count = dishes_count + 1
+        WHERE id = NEW.submenu_id;
+        UPDATE menus SET dishes_count = dishes_count + 1
+        WHERE id = (SELECT menu_id FROM submenus WHERE id = NEW.submenu_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Moves one submenu with its dishes between counters of menus.
+COUNT_SUBMENUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_submenus() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.menu_id = NEW.menu_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE menus SET
+            submenus_count = submenus_count - 1,
+            dishes_count = dishes_count - OLD.dishes_count
+        WHERE id = OLD.menu_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE menus SET
+            submenus_count = submenus_count + 1,
+            dishes_count = dishes_count + NEW.dishes_count
+        WHERE id = NEW.menu_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COUNT_DISHES_TRIGGER = """
+CREATE TRIGGER count_dishes
+AFTER INSERT OR DELETE OR UPDATE OF submenu_id ON dishes
+FOR EACH ROW EXECUTE FUNCTION count_dishes()
+"""
+
+COUNT_SUBMENUS_TRIGGER = """
+CREATE TRIGGER count_submenus
+AFTER INSERT OR DELETE OR UPDATE OF menu_id ON submenus
+FOR EACH ROW EXECUTE FUNCTION count_submenus()
+"""
+
+# Statements creating triggers of the table, by table name.
+CREATE_COUNTER_TRIGGERS = {
+    'submenus': (COUNT_SUBMENUS_FUNCTION, COUNT_SUBMENUS_TRIGGER),
+    'dishes': (COUNT_DISHES_FUNCTION, COUNT_DISHES_TRIGGER),
+}
+
+DROP_COUNTER_TRIGGERS = {
+    'submenus': (
+        'DROP TRIGGER IF EXISTS count_submenus ON submenus',
+        'DROP FUNCTION IF EXISTS count_submenus()',
+    ),
+    'dishes': (
+        'DROP TRIGGER IF EXISTS count_dishes ON dishes',
+        'DROP FUNCTION IF EXISTS count_dishes()',
+    ),
+}
+
+# Fix counters that differ from the rows, submenus first, since counts of
+# menus sum up counts of their submenus.
+RECONCILE_COUNTERS = (
+    """
+    UPDATE submenus SET dishes_count = counts.dishes_count
+    FROM (
+        SELECT submenus.id, count(dishes.id) AS dishes_count
+        FROM submenus LEFT JOIN dishes ON dishes.submenu_id = submenus.id
+        GROUP BY submenus.id
+    ) AS counts
+    WHERE submenus.id = counts.id
+        AND submenus.dishes_count <> counts.dishes_count
+    """,
+    """
+    UPDATE menus SET
+        submenus_count = counts.submenus_count,
+        dishes_count = counts.dishes_count
+    FROM (
+        SELECT
+            menus.id,
+            count(submenus.id) AS submenus_count,
+            coalesce(sum(submenus.dishes_count), 0) AS dishes_count
+        FROM menus LEFT JOIN submenus ON submenus.menu_id = menus.id
+        GROUP BY menus.id
+    ) AS counts
+    WHERE menus.id = counts.id
+        AND (
+            menus.submenus_count <> counts.submenus_count
+            OR menus.dishes_count <> counts.dishes_count
+        )
+    """,
+)
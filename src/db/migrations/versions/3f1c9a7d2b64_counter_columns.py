@@ -0,0 +1,157 @@
+"""counter columns
+
+Revision ID: 3f1c9a7d2b64
+Revises: 748f3550acdc
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = '748f3550acdc'
+branch_labels = None
+depends_on = None
+
+# Statements of the revision are kept here, so later changes of the
+# triggers in src.db.counters need a revision of their own.
+COUNT_DISHES_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_dishes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.submenu_id = NEW.submenu_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE submenus SET dishes_count = dishes_count - 1
+        WHERE id = OLD.submenu_id;
+        UPDATE menus SET dishes_count = dishes_count - 1
+        WHERE id = (SELECT menu_id FROM submenus WHERE id = OLD.submenu_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE submenus SET dishes_count = dishes_count + 1
+        WHERE id = NEW.submenu_id;
+        UPDATE menus SET dishes_count = dishes_count + 1
+        WHERE id = (SELECT menu_id FROM submenus WHERE id = NEW.submenu_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COUNT_SUBMENUS_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_submenus() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.menu_id = NEW.menu_id THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE menus SET
+            submenus_count = submenus_count - 1,
+            dishes_count = dishes_count - OLD.dishes_count
+        WHERE id = OLD.menu_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE menus SET
+            submenus_count = submenus_count + 1,
+            dishes_count = dishes_count + NEW.dishes_count
+        WHERE id = NEW.menu_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COUNT_DISHES_TRIGGER = """
+CREATE TRIGGER count_dishes
+AFTER INSERT OR DELETE OR UPDATE OF submenu_id ON dishes
+FOR EACH ROW EXECUTE FUNCTION count_dishes()
+"""
+
+COUNT_SUBMENUS_TRIGGER = """
+CREATE TRIGGER count_submenus
+AFTER INSERT OR DELETE OR UPDATE OF menu_id ON submenus
+FOR EACH ROW EXECUTE FUNCTION count_submenus()
+"""
+
+CREATE_COUNTER_TRIGGERS = {
+    'submenus': (COUNT_SUBMENUS_FUNCTION, COUNT_SUBMENUS_TRIGGER),
+    'dishes': (COUNT_DISHES_FUNCTION, COUNT_DISHES_TRIGGER),
+}
+
+DROP_COUNTER_TRIGGERS = {
+    'submenus': (
+        'DROP TRIGGER IF EXISTS count_submenus ON submenus',
+        'DROP FUNCTION IF EXISTS count_submenus()',
+    ),
+    'dishes': (
+        'DROP TRIGGER IF EXISTS count_dishes ON dishes',
+        'DROP FUNCTION IF EXISTS count_dishes()',
+    ),
+}
+
+RECONCILE_COUNTERS = (
+    """
+    UPDATE submenus SET dishes_count = counts.dishes_count
+    FROM (
+        SELECT submenus.id, count(dishes.id) AS dishes_count
+        FROM submenus LEFT JOIN dishes ON dishes.submenu_id = submenus.id
+        GROUP BY submenus.id
+    ) AS counts
+    WHERE submenus.id = counts.id
+        AND submenus.dishes_count <> counts.dishes_count
+    """,
+    """
+    UPDATE menus SET
+        submenus_count = counts.submenus_count,
+        dishes_count = counts.dishes_count
+    FROM (
+        SELECT
+            menus.id,
+            count(submenus.id) AS submenus_count,
+            coalesce(sum(submenus.dishes_count), 0) AS dishes_count
+        FROM menus LEFT JOIN submenus ON submenus.menu_id = menus.id
+        GROUP BY menus.id
+    ) AS counts
+    WHERE menus.id = counts.id
+        AND (
+            menus.submenus_count <> counts.submenus_count
+            OR menus.dishes_count <> counts.dishes_count
+        )
+    """,
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'menus',
+        sa.Column(
+            'submenus_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    op.add_column(
+        'menus',
+        sa.Column(
+            'dishes_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    op.add_column(
+        'submenus',
+        sa.Column(
+            'dishes_count', sa.Integer(), server_default='0', nullable=False
+        ),
+    )
+    for statement in RECONCILE_COUNTERS:
+        op.execute(statement)
+    for table in ('submenus', 'dishes'):
+        for statement in CREATE_COUNTER_TRIGGERS[table]:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    for table in ('dishes', 'submenus'):
+        for statement in DROP_COUNTER_TRIGGERS[table]:
+            op.execute(statement)
+    op.drop_column('submenus', 'dishes_count')
+    op.drop_column('menus', 'dishes_count')
+    op.drop_column('menus', 'submenus_count')
@@ -0,0 +1,73 @@
+"""catalog view
+
+Revision ID: 8a2e5c4f7b19
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8a2e5c4f7b19'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+# Statements of the revision are kept here, so later changes of the view
+# in src.db.catalog_view need a revision of their own.
+CREATE_CATALOG_VIEW = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS catalog_view AS
+SELECT
+    menus.id,
+    'menu' AS kind,
+    menus.id AS menu_id,
+    NULL::uuid AS submenu_id,
+    menus.title,
+    menus.description,
+    NULL::numeric(7, 2) AS price,
+    menus.submenus_count,
+    menus.dishes_count
+FROM menus
+UNION ALL
+SELECT
+    submenus.id,
+    'submenu',
+    submenus.menu_id,
+    submenus.id,
+    submenus.title,
+    submenus.description,
+    NULL,
+    NULL,
+    submenus.dishes_count
+FROM submenus
+UNION ALL
+SELECT
+    dishes.id,
+    'dish',
+    submenus.menu_id,
+    dishes.submenu_id,
+    dishes.title,
+    dishes.description,
+    dishes.price,
+    NULL,
+    NULL
+FROM dishes JOIN submenus ON submenus.id = dishes.submenu_id
+"""
+
+CREATE_CATALOG_VIEW_INDEXES = (
+    'CREATE UNIQUE INDEX IF NOT EXISTS ix_catalog_view_id ON catalog_view (id)',
+    'CREATE INDEX IF NOT EXISTS ix_catalog_view_kind_menu_id '
+    'ON catalog_view (kind, menu_id)',
+)
+
+DROP_CATALOG_VIEW = 'DROP MATERIALIZED VIEW IF EXISTS catalog_view'
+
+
+def upgrade() -> None:
+    op.execute(CREATE_CATALOG_VIEW)
+    for statement in CREATE_CATALOG_VIEW_INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute(DROP_CATALOG_VIEW)
@@ -0,0 +1,28 @@
+"""pagination indexes
+
+Revision ID: c5d81f3a9e20
+Revises: 8a2e5c4f7b19
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c5d81f3a9e20'
+down_revision = '8a2e5c4f7b19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_submenus_menu_id_id', 'submenus', ['menu_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_dishes_submenu_id_id', 'dishes', ['submenu_id', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dishes_submenu_id_id', table_name='dishes')
+    op.drop_index('ix_submenus_menu_id_id', table_name='submenus')
@@ -0,0 +1,28 @@
+"""catalog view menu index
+
+Revision ID: d4b7e1a96c32
+Revises: c5d81f3a9e20
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd4b7e1a96c32'
+down_revision = 'c5d81f3a9e20'
+branch_labels = None
+depends_on = None
+
+CREATE_CATALOG_VIEW_MENU_INDEX = (
+    'CREATE INDEX IF NOT EXISTS ix_catalog_view_menu_id '
+    'ON catalog_view (menu_id)'
+)
+DROP_CATALOG_VIEW_MENU_INDEX = 'DROP INDEX IF EXISTS ix_catalog_view_menu_id'
+
+
+def upgrade() -> None:
+    op.execute(CREATE_CATALOG_VIEW_MENU_INDEX)
+
+
+def downgrade() -> None:
+    op.execute(DROP_CATALOG_VIEW_MENU_INDEX)
@@ -1,12 +1,21 @@
 import uuid
 from decimal import Decimal
+from typing import cast
 
 import sqlalchemy as sa
-from sqlalchemy import Numeric, UniqueConstraint
+from sqlalchemy import DDL, Index, Numeric, Table, UniqueConstraint, event
 from sqlalchemy.dialects.postgresql import TEXT, UUID
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from src.db.catalog_view import (
+    CREATE_CATALOG_VIEW,
+    CREATE_CATALOG_VIEW_INDEXES,
+    CREATE_CATALOG_VIEW_MENU_INDEX,
+    DROP_CATALOG_VIEW,
+)
+from src.db.counters import CREATE_COUNTER_TRIGGERS, DROP_COUNTER_TRIGGERS
+
 
 class Base(AsyncAttrs, DeclarativeBase):
     """Base class for database models with UUID-based primary key."""
@@ -28,6 +37,12 @@ class Menu(Base):
 
     title: Mapped[str] = mapped_column(TEXT, nullable=False, unique=True)
     description: Mapped[str] = mapped_column(TEXT, nullable=False)
+    submenus_count: Mapped[int] = mapped_column(
+        default=0, server_default='0', nullable=False
+    )
+    dishes_count: Mapped[int] = mapped_column(
+        default=0, server_default='0', nullable=False
+    )
     submenus: Mapped[list['Submenu']] = relationship(
         'Submenu',
         back_populates='menu',
@@ -46,6 +61,9 @@ class Submenu(Base):
     menu_id: Mapped[UUID | None] = mapped_column(
         sa.ForeignKey('menus.id'), nullable=False
     )
+    dishes_count: Mapped[int] = mapped_column(
+        default=0, server_default='0', nullable=False
+    )
     menu: Mapped['Menu'] = relationship(
         'Menu', back_populates='submenus', lazy='selectin'
     )
@@ -57,7 +75,11 @@ class Submenu(Base):
         lazy='selectin',
     )
 
-    __table_args__ = (UniqueConstraint('title', 'menu_id'),)
+    __table_args__ = (
+        UniqueConstraint('title', 'menu_id'),
+        # Keyset pagination of submenus of the menu.
+        Index('ix_submenus_menu_id_id', 'menu_id', 'id'),
+    )
 
 
 class Dish(Base):
@@ -76,3 +98,41 @@ class Dish(Base):
     submenu: Mapped['Submenu'] = relationship(
         'Submenu', back_populates='dishes', lazy='selectin'
     )
+
+    # Keyset pagination of dishes of the submenu.
+    __table_args__ = (Index('ix_dishes_submenu_id_id', 'submenu_id', 'id'),)
+
+
+# Counter columns are maintained by triggers, also in tables created from
+# the metadata, like in tests.
+for table in (cast(Table, Submenu.__table__), cast(Table, Dish.__table__)):
+    for statement in CREATE_COUNTER_TRIGGERS[table.name]:
+        event.listen(
+            table,
+            'after_create',
+            DDL(statement).execute_if(dialect='postgresql'),
+        )
+    for statement in DROP_COUNTER_TRIGGERS[table.name]:
+        event.listen(
+            table,
+            'before_drop',
+            DDL(statement).execute_if(dialect='postgresql'),
+        )
+
+# Catalog view selects from all tables, dishes are created last and
+# dropped first.
+for statement in (
+    CREATE_CATALOG_VIEW,
+    *CREATE_CATALOG_VIEW_INDEXES,
+    CREATE_CATALOG_VIEW_MENU_INDEX,
+):
+    event.listen(
+        Dish.__table__,
+        'after_create',
+        DDL(statement).execute_if(dialect='postgresql'),
+    )
+event.listen(
+    Dish.__table__,
+    'before_drop',
+    DDL(DROP_CATALOG_VIEW).execute_if(dialect='postgresql'),
+)
@@ -0,0 +1,100 @@
+from redis import asyncio as aioredis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.connection import ConnectionPool
+
+from src.core.settings import settings
+
+_pool: ConnectionPool | None = None
+_client: aioredis.Redis | RedisCluster | None = None
+_pubsub_client: aioredis.Redis | None = None
+
+
+def get_redis_pool() -> ConnectionPool:
+    """Get process-wide Redis connection pool, create it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+    return _pool
+
+
+def get_redis() -> aioredis.Redis | RedisCluster:
+    """
+    Get Redis client bound to the shared connection pool, or cluster
+    client with pools of its nodes if REDIS_CLUSTER is set.
+    """
+    global _client
+    if _client is None:
+        if settings.REDIS_CLUSTER:
+            _client = RedisCluster.from_url(
+                settings.redis_url,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            )
+        else:
+            _client = aioredis.Redis(connection_pool=get_redis_pool())
+    return _client
+
+
+def get_pubsub_redis() -> aioredis.Redis:
+    """
+    Get client for publish and subscribe on the shared pool. Cluster
+    client has no pub/sub, messages published on a node reach all nodes.
+    """
+    global _pubsub_client
+    if _pubsub_client is None:
+        _pubsub_client = aioredis.Redis(connection_pool=get_redis_pool())
+    return _pubsub_client
+
+
+async def open_redis_pool() -> None:
+    """Create the shared pool on application startup."""
+    get_redis()
+
+
+async def close_redis_pool() -> None:
+    """Close all connections of the shared pool."""
+    global _pool, _client, _pubsub_client
+    if _client is not None:
+        await _client.close()
+        _client = None
+    if _pubsub_client is not None:
+        await _pubsub_client.close()
+        _pubsub_client = None
+    if _pool is not None:
+        await _pool.disconnect()
+        _pool = None
+
+
+def get_redis_pool_stats() -> dict[str, int]:
+    """Get usage statistics of the shared pool, summed over cluster nodes."""
+    if isinstance(_client, RedisCluster):
+        nodes = _client.get_nodes()
+        created = sum(len(node._connections) for node in nodes)
+        available = sum(len(node._free) for node in nodes)
+        return {
+            'max_connections': settings.REDIS_MAX_CONNECTIONS * len(nodes),
+            'created_connections': created,
+            'in_use_connections': created - available,
+            'available_connections': available,
+        }
+    if _pool is None:
+        return {
+            'max_connections': settings.REDIS_MAX_CONNECTIONS,
+            'created_connections': 0,
+            'in_use_connections': 0,
+            'available_connections': 0,
+        }
+    return {
+        'max_connections': _pool.max_connections,
+        'created_connections': _pool._created_connections,
+        'in_use_connections': len(_pool._in_use_connections),
+        'available_connections': len(_pool._available_connections),
+    }
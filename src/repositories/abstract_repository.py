@@ -2,7 +2,7 @@ import abc
 from typing import Generic, TypeVar
 
 from pydantic import UUID4
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -36,6 +36,21 @@ class AbstractRepository(Generic[DatabaseModel], abc.ABC):
         self._session = session
         self._model = model
 
+    @staticmethod
+    def paginate(
+        stmt: Select, id_column, limit: int | None, cursor: UUID4 | None
+    ) -> Select:
+        """
+        Select a page of rows ordered by id, starting after the cursor.
+        Pages are read by an index on the filter columns and id, without
+        scanning skipped rows as offset does.
+        """
+        if cursor is not None:
+            stmt = stmt.where(id_column > cursor)
+        if limit is not None:
+            stmt = stmt.order_by(id_column).limit(limit)
+        return stmt
+
     async def create(self, instance: DatabaseModel) -> DatabaseModel:
         """
         Create object in the database. Raise error if object already
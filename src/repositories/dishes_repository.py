@@ -22,10 +22,26 @@ class DishRepository(AbstractRepository):
         """Get dish by dish_id."""
         return await self.get_instance(dish_id)
 
+    async def get_dish_parent_ids_db(
+        self, dish_id: UUID
+    ) -> tuple[UUID, UUID]:
+        """Get ids of menu and submenu the dish belongs to."""
+        stmt = select(Submenu.menu_id, Submenu.id).join(Dish).where(
+            Dish.id == dish_id
+        )
+        parent_ids = (await self._session.execute(stmt)).first()
+        if parent_ids is None:
+            raise exceptions.ObjectNotFoundError('dish not found')
+        return parent_ids.menu_id, parent_ids.id
+
     async def get_list_of_dishes_db(
-        self, menu_id: UUID, submenu_id: UUID
+        self,
+        menu_id: UUID,
+        submenu_id: UUID,
+        limit: int | None = None,
+        cursor: UUID | None = None,
     ) -> list[Dish]:
-        """Get all dishes for submenu."""
+        """Get all dishes for submenu, or a page after the cursor."""
         stmt = (
             select(Dish)
             .join(Submenu)
@@ -35,6 +51,7 @@ class DishRepository(AbstractRepository):
                 Menu.id == menu_id,
             )
         )
+        stmt = self.paginate(stmt, Dish.id, limit, cursor)
 
         dishes = await self._session.execute(stmt)
         return dishes.scalars().all()
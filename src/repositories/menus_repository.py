@@ -1,18 +1,66 @@
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from typing import cast
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, select
+from sqlalchemy import CursorResult, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from starlette.responses import JSONResponse
 
 from src.api.request_models.request_base import MenuRequest
+from src.api.response_models.dish_response import DishMenusResponse
 from src.api.response_models.menu_response import MenuInfResponse, MenuSummaryResponse
+from src.api.response_models.submenu_response import SubmenusSummaryResponse
 from src.core import exceptions
+from src.core.settings import settings
+from src.db.catalog_view import REFRESH_CATALOG_VIEW, catalog_view
+from src.db.counters import RECONCILE_COUNTERS
 from src.db.db import get_session
-from src.db.models import Dish, Menu, Submenu
+from src.db.models import Menu, Submenu
 from src.repositories.abstract_repository import AbstractRepository
 
+# One JSON document per menu with its submenus and dishes, fields in the
+# order of MenuSummaryResponse. Prices are text, as Decimal in responses.
+FULL_MENUS_JSON_QUERY = """
+SELECT json_build_object(
+    'id', menus.id,
+    'title', menus.title,
+    'description', menus.description,
+    'submenus', coalesce(
+        (
+            SELECT json_agg(
+                json_build_object(
+                    'id', submenus.id,
+                    'title', submenus.title,
+                    'description', submenus.description,
+                    'dishes', coalesce(
+                        (
+                            SELECT json_agg(
+                                json_build_object(
+                                    'id', dishes.id,
+                                    'title', dishes.title,
+                                    'description', dishes.description,
+                                    'price', dishes.price::text
+                                )
+                            )
+                            FROM dishes
+                            WHERE dishes.submenu_id = submenus.id
+                        ),
+                        '[]'::json
+                    )
+                )
+            )
+            FROM submenus
+            WHERE submenus.menu_id = menus.id
+        ),
+        '[]'::json
+    )
+)::text
+FROM menus
+"""
+
 
 class MenuRepository(AbstractRepository):
     """Repository associated with model Menu."""
@@ -26,58 +74,65 @@ class MenuRepository(AbstractRepository):
 
     async def get_menu_db_with_counts(self, menu_id: UUID) -> MenuInfResponse:
         """Get menu by menu_id with submenu and dish counts."""
-        stmt = (
-            select(
-                Menu,
-                func.count(Submenu.id.distinct()).label('submenus_count'),
-                func.count(Dish.id.distinct()).label('dishes_count'),
-            )
-            .outerjoin(Submenu, Menu.submenus)
-            .outerjoin(Dish, Submenu.dishes)
-            .where(Menu.id == menu_id)
-            .group_by(Menu.id)
-        )
+        stmt = select(*self._info_columns()).where(Menu.id == menu_id)
         menu_with_counts = (await self._session.execute(stmt)).first()
 
         if menu_with_counts:
-            menu, submenus_count, dishes_count = menu_with_counts
-            menu_response = MenuInfResponse(
-                id=menu.id,
-                title=menu.title,
-                description=menu.description,
-                submenus_count=submenus_count,
-                dishes_count=dishes_count,
-            )
-            return menu_response
+            return MenuInfResponse.from_orm(menu_with_counts)
 
         raise exceptions.ObjectNotFoundError('menu not found')
 
-    async def get_list_of_menus_db(self) -> list[MenuInfResponse]:
-        """Get list of menus with quantity of submenus and dishes."""
-        stmt = (
-            select(
-                Menu,
-                func.count(Submenu.id).label('submenus_count'),
-                func.count(Dish.id).label('dishes_count'),
+    async def get_list_of_menus_db(
+        self, limit: int | None = None, cursor: UUID | None = None
+    ) -> list[MenuInfResponse]:
+        """
+        Get list of menus with quantity of submenus and dishes, all or a
+        page after the cursor.
+        """
+        if settings.CATALOG_VIEW_ENABLED:
+            stmt = select(
+                catalog_view.c.id,
+                catalog_view.c.title,
+                catalog_view.c.description,
+                catalog_view.c.submenus_count,
+                catalog_view.c.dishes_count,
+            ).where(catalog_view.c.kind == 'menu')
+            stmt = self.paginate(stmt, catalog_view.c.id, limit, cursor)
+        else:
+            stmt = self.paginate(
+                select(*self._info_columns()), Menu.id, limit, cursor
             )
-            .join(Menu.submenus, isouter=True)
-            .join(Submenu.dishes, isouter=True)
-            .group_by(Menu.id)
-        )
         menus_with_counts = await self._session.execute(stmt)
+        return [
+            MenuInfResponse.from_orm(menu_with_counts)
+            for menu_with_counts in menus_with_counts
+        ]
+
+    @staticmethod
+    def _info_columns() -> tuple:
+        """
+        Columns of menu with counts, kept by triggers. Columns are read
+        instead of the model, so counts changed by triggers in the same
+        session are not hidden by the identity map.
+        """
+        return (
+            Menu.id,
+            Menu.title,
+            Menu.description,
+            Menu.submenus_count,
+            Menu.dishes_count,
+        )
 
-        menu_responses = []
-        for menu, submenus_count, dishes_count in menus_with_counts:
-            menu_response = MenuInfResponse(
-                id=menu.id,
-                title=menu.title,
-                description=menu.description,
-                submenus_count=submenus_count,
-                dishes_count=dishes_count,
+    async def reconcile_counts_db(self) -> int:
+        """Fix counts of menus and submenus, return number of fixed rows."""
+        fixed = 0
+        for statement in RECONCILE_COUNTERS:
+            result = cast(
+                CursorResult, await self._session.execute(text(statement))
             )
-            menu_responses.append(menu_response)
-
-        return menu_responses
+            fixed += result.rowcount
+        await self._session.commit()
+        return fixed
 
     async def create_menu_db(self, schema: MenuRequest) -> Menu:
         """Create menu object in the database."""
@@ -103,9 +158,79 @@ class MenuRepository(AbstractRepository):
             },
         )
 
-    async def get_full_menus_info_db(self) -> list[MenuSummaryResponse]:
+    async def get_full_menus_info_db(
+        self, menu_ids: list[UUID] | None = None
+    ) -> list[MenuSummaryResponse]:
+        """Get menus with submenus and dishes, all or only given ones."""
+        if settings.CATALOG_VIEW_ENABLED:
+            return await self._get_full_menus_info_from_view(menu_ids)
         stmt = select(Menu).options(
             selectinload(Menu.submenus).selectinload(Submenu.dishes))
+        if menu_ids is not None:
+            stmt = stmt.where(Menu.id.in_(menu_ids))
         result = await self._session.execute(stmt)
         menus = result.scalars().all()
         return menus
+
+    async def _get_full_menus_info_from_view(
+        self, menu_ids: list[UUID] | None
+    ) -> list[MenuSummaryResponse]:
+        """Assemble menus trees from rows of the catalog view."""
+        stmt = select(catalog_view)
+        if menu_ids is not None:
+            stmt = stmt.where(catalog_view.c.menu_id.in_(menu_ids))
+        rows_by_kind = defaultdict(list)
+        for row in await self._session.execute(stmt):
+            rows_by_kind[row.kind].append(row)
+        menus = {
+            row.id: MenuSummaryResponse(
+                id=row.id,
+                title=row.title,
+                description=row.description,
+                submenus=[],
+            )
+            for row in rows_by_kind['menu']
+        }
+        submenus = {}
+        for row in rows_by_kind['submenu']:
+            submenus[row.id] = SubmenusSummaryResponse(
+                id=row.id,
+                title=row.title,
+                description=row.description,
+                dishes=[],
+            )
+            menus[row.menu_id].submenus.append(submenus[row.id])
+        for row in rows_by_kind['dish']:
+            submenus[row.submenu_id].dishes.append(
+                DishMenusResponse(
+                    id=row.id,
+                    title=row.title,
+                    description=row.description,
+                    price=row.price,
+                )
+            )
+        return list(menus.values())
+
+    async def refresh_catalog_view_db(self) -> None:
+        """Refresh the catalog view, readers keep reading the old rows."""
+        await self._session.execute(text(REFRESH_CATALOG_VIEW))
+        await self._session.commit()
+
+    async def stream_full_menus_json_db(self) -> AsyncIterator[bytes]:
+        """
+        Stream JSON array of menus with submenus and dishes, built by the
+        database. Menus are fetched one by one, no ORM objects are made.
+        """
+        result = await self._session.stream(text(FULL_MENUS_JSON_QUERY))
+        separator = b'['
+        async for (menu_json,) in result:
+            yield separator + menu_json.encode()
+            separator = b','
+        yield b'[]' if separator == b'[' else b']'
+
+    async def get_menu_ids_db(self) -> list[UUID]:
+        """Get ids of all menus ordered by id, as menus pages are."""
+        result = await self._session.execute(
+            select(Menu.id).order_by(Menu.id)
+        )
+        return list(result.scalars().all())
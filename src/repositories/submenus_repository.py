@@ -1,13 +1,15 @@
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from src.api.request_models.request_base import MenuRequest
 from src.api.response_models.submenu_response import SubmenuInfoResponse
 from src.core import exceptions
+from src.core.settings import settings
+from src.db.catalog_view import catalog_view
 from src.db.db import get_session
 from src.db.models import Menu, Submenu
 from src.repositories.abstract_repository import AbstractRepository
@@ -20,29 +22,48 @@ class SubmenuRepository(AbstractRepository):
         super().__init__(session, Submenu)
 
     async def get_list_of_submenus_db(
-        self, menu_id: UUID
+        self,
+        menu_id: UUID,
+        limit: int | None = None,
+        cursor: UUID | None = None,
     ) -> list[SubmenuInfoResponse]:
-        """Get all submenus for menu with quantity of dishes from database."""
-        stmt = (
-            select(Submenu, func.count(Submenu.dishes).label('dishes_count'))
-            .join(Submenu.dishes, isouter=True)
-            .where(Submenu.menu_id == menu_id)
-            .group_by(Submenu)
-        )
-        submenus_with_counts = (await self._session.execute(stmt)).all()
-
-        submenu_responses = [
-            SubmenuInfoResponse(
-                id=submenu.id,
-                title=submenu.title,
-                description=submenu.description,
-                menu_id=submenu.menu_id,
-                dishes_count=dishes_count,
+        """
+        Get all submenus for menu with quantity of dishes from database,
+        or a page after the cursor.
+        """
+        if settings.CATALOG_VIEW_ENABLED:
+            stmt = select(
+                catalog_view.c.id,
+                catalog_view.c.title,
+                catalog_view.c.description,
+                catalog_view.c.menu_id,
+                catalog_view.c.dishes_count,
+            ).where(
+                catalog_view.c.kind == 'submenu',
+                catalog_view.c.menu_id == menu_id,
+            )
+            stmt = self.paginate(stmt, catalog_view.c.id, limit, cursor)
+        else:
+            stmt = select(*self._info_columns()).where(
+                Submenu.menu_id == menu_id
             )
-            for submenu, dishes_count in submenus_with_counts
+            stmt = self.paginate(stmt, Submenu.id, limit, cursor)
+        submenus_with_counts = await self._session.execute(stmt)
+        return [
+            SubmenuInfoResponse.from_orm(submenu_with_counts)
+            for submenu_with_counts in submenus_with_counts
         ]
 
-        return submenu_responses
+    @staticmethod
+    def _info_columns() -> tuple:
+        """Columns of submenu with count of dishes, kept by triggers."""
+        return (
+            Submenu.id,
+            Submenu.title,
+            Submenu.description,
+            Submenu.menu_id,
+            Submenu.dishes_count,
+        )
 
     async def get_submenu_db(self, submenu_id: UUID):
         """Get submenu by submenu_id."""
@@ -52,24 +73,11 @@ class SubmenuRepository(AbstractRepository):
         self, submenu_id: UUID
     ) -> SubmenuInfoResponse:
         """Get submenu with count of dishes from database."""
-        stmt = (
-            select(Submenu, func.count(Submenu.dishes).label('dishes_count'))
-            .join(Submenu.dishes, isouter=True)
-            .where(Submenu.id == submenu_id)
-            .group_by(Submenu)
-        )
+        stmt = select(*self._info_columns()).where(Submenu.id == submenu_id)
         submenu_with_counts = (await self._session.execute(stmt)).first()
 
         if submenu_with_counts:
-            submenu, dishes_count = submenu_with_counts
-            response = SubmenuInfoResponse(
-                id=submenu.id,
-                title=submenu.title,
-                description=submenu.description,
-                menu_id=submenu.menu_id,
-                dishes_count=dishes_count,
-            )
-            return response
+            return SubmenuInfoResponse.from_orm(submenu_with_counts)
 
         raise exceptions.ObjectNotFoundError('submenu not found')
 
@@ -0,0 +1,65 @@
+from src.core.settings import settings
+from src.services import cache_codec
+from src.services.cache_backends.abstract_backend import (
+    AbstractCacheBackend,
+    CacheUnavailableError,
+)
+from src.services.cache_backends.circuit_breaker import CircuitBreakerBackend
+from src.services.cache_backends.memory_backend import MemoryCacheBackend
+from src.services.cache_backends.redis_backend import RedisCacheBackend
+
+_backend: AbstractCacheBackend | None = None
+
+
+def get_cache_namespace() -> str:
+    """
+    Prefix of cache keys in shared storage. It changes with release cache
+    version and codec schema version, so only incompatible caches are
+    left behind on deploy.
+    """
+    return (
+        f'{settings.CACHE_NAMESPACE}:{settings.CACHE_VERSION}:'
+        f'{cache_codec.SCHEMA_VERSION}:'
+    )
+
+
+def get_cache_backend() -> AbstractCacheBackend:
+    """Get process-wide cache backend selected by settings."""
+    global _backend
+    if _backend is None:
+        if settings.CACHE_BACKEND == 'memory':
+            _backend = MemoryCacheBackend(
+                max_entries=settings.CACHE_MEMORY_MAX_ENTRIES,
+                max_bytes=settings.CACHE_MEMORY_MAX_BYTES,
+            )
+        else:
+            _backend = CircuitBreakerBackend(
+                RedisCacheBackend(
+                    prefix=get_cache_namespace(),
+                    cluster=settings.REDIS_CLUSTER,
+                ),
+                timeout=settings.CACHE_CALL_TIMEOUT,
+                failure_threshold=settings.CACHE_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=settings.CACHE_BREAKER_RECOVERY_TIMEOUT,
+            )
+    return _backend
+
+
+async def close_cache_backend() -> None:
+    """Release resources of the cache backend on application shutdown."""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+__all__ = [
+    'AbstractCacheBackend',
+    'CacheUnavailableError',
+    'CircuitBreakerBackend',
+    'MemoryCacheBackend',
+    'RedisCacheBackend',
+    'close_cache_backend',
+    'get_cache_backend',
+    'get_cache_namespace',
+]
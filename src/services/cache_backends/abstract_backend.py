@@ -0,0 +1,69 @@
+import abc
+
+
+class CacheUnavailableError(Exception):
+    """Cache backend failed or is not called until it recovers."""
+
+
+class AbstractCacheBackend(abc.ABC):
+    """
+    Storage used by CacheService. Values are serialized bytes, lifetimes
+    are in seconds. Keys passed to backend are already physical ones.
+    """
+
+    @property
+    def available(self) -> bool:
+        """Whether calls are expected to reach the storage."""
+        return True
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get value of the key."""
+
+    @abc.abstractmethod
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, int | None]:
+        """Get value of the key and its time to live in milliseconds."""
+
+    @abc.abstractmethod
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        """Get values of several keys, None for missing ones."""
+
+    @abc.abstractmethod
+    async def set_many(
+        self,
+        values: dict[str, bytes],
+        lifetime: int,
+        tags: dict[str, list[str]],
+        tags_lifetime: int,
+    ) -> None:
+        """
+        Save values and record each key under its tags, given from the
+        widest to the narrowest, atomically.
+        """
+
+    @abc.abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        """Delete keys."""
+
+    @abc.abstractmethod
+    async def invalidate_tag(self, tag: str) -> list[str]:
+        """Delete keys recorded under the tag, return deleted keys."""
+
+    @abc.abstractmethod
+    async def incr(self, key: str) -> int:
+        """Increase integer value of the key, missing key counts as 0."""
+
+    @abc.abstractmethod
+    async def acquire_lock(self, key: str, token: str, timeout: float) -> bool:
+        """Set key to token unless it exists, expire after timeout seconds."""
+
+    @abc.abstractmethod
+    async def release_lock(self, key: str, token: str) -> None:
+        """Delete key only if it still holds the token."""
+
+    @abc.abstractmethod
+    async def flush(self) -> None:
+        """Delete all keys."""
+
+    async def close(self) -> None:
+        """Release resources of the backend."""
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from src.services.cache_backends.abstract_backend import (
+    AbstractCacheBackend,
+    CacheUnavailableError,
+)
+from src.services.cache_metrics import cache_metrics
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# Invalidations kept for retry. When more are lost, the namespace is
+# flushed after the circuit recovers, within the timeout in seconds.
+LOST_WRITES_LIMIT = 1000
+RECOVERY_FLUSH_TIMEOUT = 60.0
+
+
+class CircuitBreakerBackend(AbstractCacheBackend):
+    """
+    Wrapper limiting calls of the backend by timeout. After
+    failure_threshold failures in a row the circuit opens and calls fail
+    at once with CacheUnavailableError. After recovery_timeout the next
+    call probes the backend and closes the circuit on success.
+
+    Lost deletes, invalidations of tags and bumps of generations may
+    leave stale values, so they are retried before the next call. Lost
+    fills leave the old value or none and are not retried. If too many
+    writes are lost, the namespace is flushed in background after the
+    circuit recovers. Invalidations may delete many keys, so they are
+    limited by socket timeout of the backend only.
+    """
+
+    def __init__(
+        self,
+        backend: AbstractCacheBackend,
+        timeout: float,
+        failure_threshold: int,
+        recovery_timeout: float,
+    ) -> None:
+        self.backend = backend
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lost_keys: set[str] = set()
+        self._lost_tags: set[str] = set()
+        self._lost_bumps: set[str] = set()
+        self._flush_needed = False
+        self._flush_task: asyncio.Task | None = None
+        self._report_state()
+
+    @property
+    def available(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        recovered = time.monotonic() - self._opened_at >= self.recovery_timeout
+        return self.state == OPEN and recovered
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._call('get', key)
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, int | None]:
+        return await self._call('get_with_ttl', key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return await self._call('mget', keys)
+
+    async def set_many(
+        self,
+        values: dict[str, bytes],
+        lifetime: int,
+        tags: dict[str, list[str]],
+        tags_lifetime: int,
+    ) -> None:
+        await self._call('set_many', values, lifetime, tags, tags_lifetime)
+
+    async def delete(self, keys: list[str]) -> None:
+        try:
+            await self._call('delete', keys, timed=False)
+        except CacheUnavailableError:
+            self._lose(self._lost_keys, keys)
+            raise
+
+    async def invalidate_tag(self, tag: str) -> list[str]:
+        try:
+            return await self._call('invalidate_tag', tag, timed=False)
+        except CacheUnavailableError:
+            self._lose(self._lost_tags, [tag])
+            raise
+
+    async def incr(self, key: str) -> int:
+        try:
+            return await self._call('incr', key)
+        except CacheUnavailableError:
+            self._lose(self._lost_bumps, [key])
+            raise
+
+    async def acquire_lock(self, key: str, token: str, timeout: float) -> bool:
+        return await self._call('acquire_lock', key, token, timeout)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        await self._call('release_lock', key, token)
+
+    async def flush(self) -> None:
+        # Flushing scans the whole namespace, so it has no call timeout.
+        await self.backend.flush()
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        await self.backend.close()
+
+    async def _call(self, method: str, *args: Any, timed: bool = True) -> Any:
+        """Call backend method within timeout and track its failures."""
+        if not self._allow_call():
+            cache_metrics.incr_total('circuit_breaker_rejected_calls')
+            raise CacheUnavailableError(f'Cache circuit is {self.state}')
+        try:
+            await self._retry_lost_writes()
+            call = getattr(self.backend, method)(*args)
+            if timed:
+                call = asyncio.wait_for(call, self.timeout)
+            result = await call
+        except (RedisError, OSError, asyncio.TimeoutError) as error:
+            self._record_failure(method, error)
+            raise CacheUnavailableError(str(error)) from error
+        except BaseException:
+            # Cancelled probe must not leave the circuit half open.
+            if self.state == HALF_OPEN:
+                self._open()
+            raise
+        self._record_success()
+        return result
+
+    def _lose(self, lost: set[str], items: list[str]) -> None:
+        """Keep lost writes for retry, or flush if there are too many."""
+        lost.update(items)
+        lost_writes = (self._lost_keys, self._lost_tags, self._lost_bumps)
+        if sum(map(len, lost_writes)) > LOST_WRITES_LIMIT:
+            for writes in lost_writes:
+                writes.clear()
+            self._flush_needed = True
+
+    async def _retry_lost_writes(self) -> None:
+        """Retry lost writes, so calls do not see stale values."""
+        keys, self._lost_keys = self._lost_keys, set()
+        tags, self._lost_tags = self._lost_tags, set()
+        bumps, self._lost_bumps = self._lost_bumps, set()
+        try:
+            if keys:
+                await self.backend.delete(list(keys))
+                keys.clear()
+            for tag in list(tags):
+                await self.backend.invalidate_tag(tag)
+                tags.discard(tag)
+            for key in list(bumps):
+                await self.backend.incr(key)
+                bumps.discard(key)
+        finally:
+            self._lost_keys |= keys
+            self._lost_tags |= tags
+            self._lost_bumps |= bumps
+
+    async def _flush_after_recovery(self) -> None:
+        """Flush the namespace after more writes were lost than kept."""
+        try:
+            await asyncio.wait_for(
+                self.backend.flush(), RECOVERY_FLUSH_TIMEOUT
+            )
+        except Exception as error:
+            logger.warning('Cache flush after recovery failed: %r', error)
+            self._flush_needed = True
+        else:
+            logger.info('Cache flushed after lost writes')
+
+    def _allow_call(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.available:
+            # This call is the probe, others fail until it finishes.
+            self.state = HALF_OPEN
+            self._report_state()
+            return True
+        return False
+
+    def _record_failure(self, method: str, error: Exception) -> None:
+        cache_metrics.incr_total('circuit_breaker_failures')
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state == CLOSED:
+                logger.warning(
+                    'Cache circuit opened after %s failed: %r', method, error
+                )
+                cache_metrics.incr_total('circuit_breaker_opened')
+            self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._report_state()
+
+    def _record_success(self) -> None:
+        self.failures = 0
+        if self.state == HALF_OPEN:
+            logger.info('Cache circuit closed')
+            self.state = CLOSED
+            self._report_state()
+            if self._flush_needed:
+                self._flush_needed = False
+                self._flush_task = asyncio.create_task(
+                    self._flush_after_recovery()
+                )
+
+    def _report_state(self) -> None:
+        cache_metrics.set_gauge('circuit_breaker_state', self.state)
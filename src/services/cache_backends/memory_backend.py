@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+
+from src.services.cache_backends.abstract_backend import AbstractCacheBackend
+
+
+class MemoryCacheBackend(AbstractCacheBackend):
+    """
+    Cache backend inside the process for single-node deployments and
+    tests. Values are evicted by TTL and least recently used first when
+    entries or bytes bounds are exceeded. Integer counters have the same
+    entries bound, evicting one of them drops all values too, so values
+    under a forgotten tag generation are not reachable again.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._values: OrderedDict[str, tuple[bytes, float | None]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._integers: OrderedDict[str, int] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._key_tags: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def size(self) -> int:
+        """Size of stored values in bytes."""
+        return self._size
+
+    async def get(self, key: str) -> bytes | None:
+        value, _ = self._get(key)
+        return value
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, int | None]:
+        value, expires_at = self._get(key)
+        if expires_at is None:
+            return value, None
+        return value, int((expires_at - time.monotonic()) * 1000)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self._get(key)[0] for key in keys]
+
+    async def set_many(
+        self,
+        values: dict[str, bytes],
+        lifetime: int,
+        tags: dict[str, list[str]],
+        tags_lifetime: int,
+    ) -> None:
+        for key, value in values.items():
+            key_tags = tags.get(key, [])
+            if not self._set(key, value, lifetime) or not key_tags:
+                continue
+            self._key_tags[key] = key_tags
+            for tag in key_tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self._pop(key)
+            self._integers.pop(key, None)
+
+    async def invalidate_tag(self, tag: str) -> list[str]:
+        keys = list(self._tags.pop(tag, ()))
+        for key in keys:
+            self._pop(key)
+        return keys
+
+    async def incr(self, key: str) -> int:
+        self._integers[key] = self._integers.get(key, 0) + 1
+        self._integers.move_to_end(key)
+        if len(self._integers) > self.max_entries:
+            self._integers.popitem(last=False)
+            self._clear_values()
+        return self._integers[key]
+
+    async def acquire_lock(self, key: str, token: str, timeout: float) -> bool:
+        if self._get(key)[0] is not None:
+            return False
+        return self._set(key, token.encode(), timeout)
+
+    async def release_lock(self, key: str, token: str) -> None:
+        if self._get(key)[0] == token.encode():
+            self._pop(key)
+
+    async def flush(self) -> None:
+        self._clear_values()
+        self._integers.clear()
+
+    def _get(self, key: str) -> tuple[bytes | None, float | None]:
+        entry = self._values.get(key)
+        if entry is None:
+            integer = self._integers.get(key)
+            return (None if integer is None else str(integer).encode()), None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._pop(key)
+            return None, None
+        self._values.move_to_end(key)
+        return value, expires_at
+
+    def _set(self, key: str, value: bytes, lifetime: float) -> bool:
+        """Store the value, return False if it is larger than all cache."""
+        self._pop(key)
+        if len(value) > self.max_bytes:
+            return False
+        self._values[key] = (value, time.monotonic() + lifetime)
+        self._size += len(value)
+        while self._overflows():
+            self._pop(next(iter(self._values)))
+        return True
+
+    def _overflows(self) -> bool:
+        entries_exceeded = len(self._values) > self.max_entries
+        return entries_exceeded or self._size > self.max_bytes
+
+    def _clear_values(self) -> None:
+        self._values.clear()
+        self._size = 0
+        self._tags.clear()
+        self._key_tags.clear()
+
+    def _pop(self, key: str) -> None:
+        entry = self._values.pop(key, None)
+        if entry is None:
+            return
+        self._size -= len(entry[0])
+        for tag in self._key_tags.pop(key, []):
+            tag_keys = self._tags.get(tag)
+            if tag_keys is not None:
+                tag_keys.discard(key)
+                if not tag_keys:
+                    del self._tags[tag]
@@ -0,0 +1,132 @@
+
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.cluster import ClusterPipeline, RedisCluster
+
+from src.db.redis_pool import close_redis_pool, get_redis
+from src.services.cache_backends.abstract_backend import AbstractCacheBackend
+from src.services.cache_keys import tag_set_key
+
+# Delete all keys recorded in the tag set and the set itself atomically.
+INVALIDATE_TAG_SCRIPT = """
+local unpack = unpack or table.unpack
+local members = redis.call('SMEMBERS', KEYS[1])
+for i = 1, #members, 1000 do
+    redis.call('DEL', unpack(members, i, math.min(i + 999, #members)))
+end
+redis.call('DEL', KEYS[1])
+return members
+"""
+
+# Release the lock only if it is still held by the same owner.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+FLUSH_BATCH_SIZE = 1000
+
+
+class RedisCacheBackend(AbstractCacheBackend):
+    """
+    Cache backend shared by all workers through Redis. All keys are
+    stored under the namespace prefix, so releases with incompatible
+    caches do not see each other's keys. In Redis Cluster writes of keys
+    from different slots are not atomic, scripts only touch keys of one
+    menu, which share the slot.
+    """
+
+    def __init__(self, prefix: str = '', cluster: bool = False) -> None:
+        self.prefix = prefix
+        self.cluster = cluster
+
+    @property
+    def redis(self) -> aioredis.Redis | RedisCluster:
+        """Client bound to the shared connection pool."""
+        return get_redis()
+
+    def _pipeline(self) -> Pipeline | ClusterPipeline:
+        """Transaction, or pipeline split by nodes in Redis Cluster."""
+        return self.redis.pipeline(transaction=not self.cluster)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.redis.get(self._key(key))
+
+    async def get_with_ttl(self, key: str) -> tuple[bytes | None, int | None]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self._key(key))
+            pipe.pttl(self._key(key))
+            value, ttl = await pipe.execute()
+        return value, ttl if ttl >= 0 else None
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        keys = [self._key(key) for key in keys]
+        if self.cluster:
+            return await self.redis.mget_nonatomic(keys)
+        return await self.redis.mget(keys)
+
+    async def set_many(
+        self,
+        values: dict[str, bytes],
+        lifetime: int,
+        tags: dict[str, list[str]],
+        tags_lifetime: int,
+    ) -> None:
+        async with self._pipeline() as pipe:
+            for key, value in values.items():
+                pipe.set(self._key(key), value, ex=lifetime)
+                tag_sets = [
+                    self._key(tag_set_key(tag)) for tag in tags.get(key, [])
+                ]
+                for index, tag_set in enumerate(tag_sets):
+                    # Invalidation drops all narrower tag sets as well,
+                    # the script does not follow nested sets.
+                    pipe.sadd(tag_set, self._key(key), *tag_sets[index + 1:])
+                    pipe.expire(tag_set, tags_lifetime)
+            await pipe.execute()
+
+    async def delete(self, keys: list[str]) -> None:
+        if keys:
+            await self.redis.delete(*(self._key(key) for key in keys))
+
+    async def invalidate_tag(self, tag: str) -> list[str]:
+        script = self.redis.register_script(INVALIDATE_TAG_SCRIPT)
+        members = await script(keys=[self._key(tag_set_key(tag))])
+        keys = [member.decode()[len(self.prefix):] for member in members]
+        return [key for key in keys if not key.startswith(tag_set_key(''))]
+
+    async def incr(self, key: str) -> int:
+        return await self.redis.incr(self._key(key))
+
+    async def acquire_lock(self, key: str, token: str, timeout: float) -> bool:
+        return bool(
+            await self.redis.set(
+                self._key(key), token, nx=True, px=int(timeout * 1000)
+            )
+        )
+
+    async def release_lock(self, key: str, token: str) -> None:
+        script = self.redis.register_script(RELEASE_LOCK_SCRIPT)
+        await script(keys=[self._key(key)], args=[token])
+
+    async def flush(self) -> None:
+        """
+        Delete keys of the namespace only, other releases keep theirs.
+        Cluster client scans and deletes keys on every primary node.
+        """
+        keys = []
+        async for key in self.redis.scan_iter(match=f'{self.prefix}*'):
+            keys.append(key)
+            if len(keys) >= FLUSH_BATCH_SIZE:
+                await self.redis.delete(*keys)
+                keys = []
+        if keys:
+            await self.redis.delete(*keys)
+
+    async def close(self) -> None:
+        await close_redis_pool()
@@ -0,0 +1,196 @@
+import json
+import struct
+import zlib
+from decimal import Decimal
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.api.response_models.dish_response import DishMenusResponse, DishResponse
+from src.api.response_models.menu_response import (
+    MenuInfResponse,
+    MenuResponse,
+    MenuSummaryResponse,
+)
+from src.api.response_models.submenu_response import (
+    SubmenuInfoResponse,
+    SubmenuResponse,
+    SubmenusSummaryResponse,
+)
+
+# Bump when layout of any registered model changes, old caches become misses.
+SCHEMA_VERSION = 2
+
+PLAIN_JSON = 0
+RESPONSE = 254
+NOT_FOUND = 255
+# Bit flags of the last header byte.
+SINGLE, LIST = 0, 1
+COMPRESSED = 2
+
+
+class NotFound(NamedTuple):
+    """Cached result of lookup of nonexistent object."""
+
+    detail: str
+
+
+class CachedResponse(NamedTuple):
+    """Cached HTTP response, the body is stored as is."""
+
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+MODEL_CODES: dict[type[BaseModel], int] = {
+    MenuResponse: 1,
+    MenuInfResponse: 2,
+    MenuSummaryResponse: 3,
+    SubmenuResponse: 4,
+    SubmenuInfoResponse: 5,
+    SubmenusSummaryResponse: 6,
+    DishResponse: 7,
+    DishMenusResponse: 8,
+}
+MODELS_BY_CODE = {code: model for model, code in MODEL_CODES.items()}
+
+HEADER = struct.Struct('>BBB')
+# Status code and size of JSON headers in front of the response body.
+RESPONSE_HEADER = struct.Struct('>HI')
+
+
+RAW, NESTED, AS_UUID, AS_DECIMAL = range(4)
+_plans: dict[type[BaseModel], list[tuple[str, int, Any, Any]]] = {}
+
+
+def _is_subclass(field_type: Any, base: type) -> bool:
+    return isinstance(field_type, type) and issubclass(field_type, base)
+
+
+def _plan(model: type[BaseModel]) -> list[tuple[str, int, Any, Any]]:
+    """Get how to convert each model field, computed once per model."""
+    if model not in _plans:
+        plan = []
+        for name, field in model.__fields__.items():
+            if _is_subclass(field.type_, BaseModel):
+                kind = NESTED
+            elif _is_subclass(field.type_, UUID):
+                kind = AS_UUID
+            elif _is_subclass(field.type_, Decimal):
+                kind = AS_DECIMAL
+            else:
+                kind = RAW
+            plan.append((name, kind, field.type_, field.default))
+        _plans[model] = plan
+    return _plans[model]
+
+
+def _to_row(model: type[BaseModel], obj: Any) -> list:
+    """Get field values of object in the order of model fields."""
+    row = []
+    for name, kind, field_type, default in _plan(model):
+        value = getattr(obj, name, default)
+        if kind == NESTED:
+            value = [_to_row(field_type, item) for item in value]
+        elif value is not None and kind != RAW:
+            value = str(value)
+        row.append(value)
+    return row
+
+
+def _from_row(model: type[BaseModel], row: list) -> BaseModel:
+    """Build model instance from row without repeated validation."""
+    values = {}
+    for (name, kind, field_type, _), value in zip(_plan(model), row):
+        if kind == NESTED:
+            value = [_from_row(field_type, item) for item in value]
+        elif value is not None and kind == AS_UUID:
+            value = UUID(value)
+        elif value is not None and kind == AS_DECIMAL:
+            value = Decimal(value)
+        values[name] = value
+    # Same as BaseModel.construct, without recomputing defaults.
+    instance = BaseModel.__new__(model)
+    object.__setattr__(instance, '__dict__', values)
+    object.__setattr__(instance, '__fields_set__', set(values))
+    return instance
+
+
+def _pack_response(response: CachedResponse) -> bytes:
+    headers = json.dumps(response.headers, separators=(',', ':')).encode()
+    prefix = RESPONSE_HEADER.pack(response.status, len(headers))
+    return b''.join((prefix, headers, response.body))
+
+
+def _unpack_response(raw_body: bytes) -> CachedResponse:
+    status, headers_size = RESPONSE_HEADER.unpack_from(raw_body)
+    headers_end = RESPONSE_HEADER.size + headers_size
+    headers = json.loads(raw_body[RESPONSE_HEADER.size:headers_end])
+    return CachedResponse(
+        status,
+        [(name, value) for name, value in headers],
+        raw_body[headers_end:],
+    )
+
+
+def encode(
+    value: Any,
+    model: type[BaseModel] | None = None,
+    compression_threshold: int = 0,
+    compression_level: int = zlib.Z_DEFAULT_COMPRESSION,
+) -> bytes:
+    """
+    Serialize response model, list of response models, HTTP response or
+    JSON value. ORM objects are converted to the given model. Bodies
+    longer than compression_threshold bytes are compressed with zlib, 0
+    disables it.
+    """
+    body: Any
+    if isinstance(value, CachedResponse):
+        code, flags, body = RESPONSE, SINGLE, None
+    elif isinstance(value, NotFound):
+        code, flags, body = NOT_FOUND, SINGLE, value.detail
+    else:
+        items = value if isinstance(value, list) else [value]
+        if model is None and items and isinstance(items[0], BaseModel):
+            model = type(items[0])
+        if model is None or model not in MODEL_CODES:
+            code, flags, body = PLAIN_JSON, SINGLE, value
+        else:
+            rows = [_to_row(model, item) for item in items]
+            code = MODEL_CODES[model]
+            flags = LIST if isinstance(value, list) else SINGLE
+            body = rows if flags & LIST else rows[0]
+    if code == RESPONSE:
+        raw_body = _pack_response(value)
+    else:
+        raw_body = json.dumps(body, separators=(',', ':')).encode()
+    if compression_threshold and len(raw_body) > compression_threshold:
+        raw_body = zlib.compress(raw_body, compression_level)
+        flags |= COMPRESSED
+    return HEADER.pack(SCHEMA_VERSION, code, flags) + raw_body
+
+
+def decode(raw_value: bytes) -> Any:
+    """Deserialize cache value, return None for unknown schema version."""
+    if len(raw_value) < HEADER.size:
+        return None
+    version, code, flags = HEADER.unpack_from(raw_value)
+    if version != SCHEMA_VERSION:
+        return None
+    raw_body = raw_value[HEADER.size:]
+    if flags & COMPRESSED:
+        raw_body = zlib.decompress(raw_body)
+    if code == RESPONSE:
+        return _unpack_response(raw_body)
+    body = json.loads(raw_body)
+    if code == PLAIN_JSON:
+        return body
+    if code == NOT_FOUND:
+        return NotFound(body)
+    model = MODELS_BY_CODE[code]
+    if flags & LIST:
+        return [_from_row(model, row) for row in body]
+    return _from_row(model, body)
@@ -0,0 +1,167 @@
+import re
+
+from pydantic import UUID4
+
+# Menu id is the hash tag of the keys, so in Redis Cluster the menu, its
+# submenus, dishes, lists and tag sets are in one slot.
+_MENU_KEY = re.compile(
+    r'^menu_id-\{(?P<menu_id>[^}]+)\}(?::submenu_id-(?P<submenu_id>[^:]+))?'
+)
+_SUBMENUS_LIST_KEY = re.compile(r'^submenus_list_\{(?P<menu_id>[^}]+)\}')
+_DISHES_LIST_KEY = re.compile(
+    r'^dishes_list_\{(?P<menu_id>[^}]+)\}_(?P<submenu_id>[^_:]+)'
+)
+
+
+LIST_MENUS_KEY = 'list_menus'
+MENUS_INDEX_KEY = 'menus_index'
+
+# Templates of keys, filled with ids of menu, submenu and dish.
+MENU_KEY_TEMPLATE = 'menu_id-{{{menu_id}}}'
+SUBMENU_KEY_TEMPLATE = f'{MENU_KEY_TEMPLATE}:submenu_id-{{submenu_id}}'
+DISH_KEY_TEMPLATE = f'{SUBMENU_KEY_TEMPLATE}:dish_id-{{dish_id}}'
+MENU_TREE_KEY_TEMPLATE = f'{MENU_KEY_TEMPLATE}:tree'
+SUBMENUS_LIST_KEY_TEMPLATE = 'submenus_list_{{{menu_id}}}'
+DISHES_LIST_KEY_TEMPLATE = 'dishes_list_{{{menu_id}}}_{submenu_id}'
+RESPONSE_KEY_TEMPLATE = 'response:{path}'
+# Pages of lists share the slot with the tag set of pages of their list.
+PAGE_KEY_SUFFIX = ':page-{limit}-{cursor}'
+LIST_MENUS_PAGE_KEY_TEMPLATE = f'{{{{{LIST_MENUS_KEY}}}}}{PAGE_KEY_SUFFIX}'
+SUBMENUS_PAGE_KEY_TEMPLATE = SUBMENUS_LIST_KEY_TEMPLATE + PAGE_KEY_SUFFIX
+DISHES_PAGE_KEY_TEMPLATE = DISHES_LIST_KEY_TEMPLATE + PAGE_KEY_SUFFIX
+
+_KEY_FAMILIES = (
+    (re.compile(r'^\{list_menus\}:page-'), 'list_menus_page'),
+    (re.compile(r'^submenus_list_[^:]+:page-'), 'submenus_page'),
+    (re.compile(r'^dishes_list_[^:]+:page-'), 'dishes_page'),
+    (re.compile(r'^menu_id-[^:]+:tree'), 'menu_tree'),
+    (re.compile(r'^menu_id-[^:]+:submenu_id-[^:]+:dish_id-'), 'dish'),
+    (re.compile(r'^menu_id-[^:]+:submenu_id-'), 'submenu'),
+    (re.compile(r'^menu_id-'), 'menu'),
+    (_SUBMENUS_LIST_KEY, 'submenus_list'),
+    (_DISHES_LIST_KEY, 'dishes_list'),
+    (re.compile(f'^{LIST_MENUS_KEY}'), 'list_menus'),
+    (re.compile(f'^{MENUS_INDEX_KEY}'), 'menus_index'),
+    (re.compile(r'^response:'), 'response'),
+)
+
+# Families of lists with cached pages.
+PAGED_LIST_FAMILIES = ('list_menus', 'submenus_list', 'dishes_list')
+# Families of lists and trees loaded from the catalog view, if enabled.
+CATALOG_VIEW_FAMILIES = (
+    'list_menus',
+    'submenus_list',
+    'menu_tree',
+    'menus_index',
+)
+
+# Generations of cached responses. Writes outside of the menus, like
+# Excel import, bump the global one, writes of a menu bump its own one
+# and the one of lists of menus.
+RESPONSES_TAG = 'responses'
+RESPONSES_LISTS_TAG = 'responses:lists'
+
+
+def menu_key(menu_id: UUID4 | str) -> str:
+    """Cache key of the menu."""
+    return MENU_KEY_TEMPLATE.format(menu_id=menu_id)
+
+
+def submenu_key(menu_id: UUID4 | str, submenu_id: UUID4 | str) -> str:
+    """Cache key of the submenu."""
+    return SUBMENU_KEY_TEMPLATE.format(menu_id=menu_id, submenu_id=submenu_id)
+
+
+def dish_key(
+    menu_id: UUID4 | str, submenu_id: UUID4 | str, dish_id: UUID4 | str
+) -> str:
+    """Cache key of the dish."""
+    return DISH_KEY_TEMPLATE.format(
+        menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id
+    )
+
+
+def menu_tree_key(menu_id: UUID4 | str) -> str:
+    """Cache key of the menu with all its submenus and dishes."""
+    return MENU_TREE_KEY_TEMPLATE.format(menu_id=menu_id)
+
+
+def submenus_list_key(menu_id: UUID4 | str) -> str:
+    """Cache key of the list of menu submenus."""
+    return SUBMENUS_LIST_KEY_TEMPLATE.format(menu_id=menu_id)
+
+
+def dishes_list_key(menu_id: UUID4 | str, submenu_id: UUID4 | str) -> str:
+    """Cache key of the list of submenu dishes."""
+    return DISHES_LIST_KEY_TEMPLATE.format(
+        menu_id=menu_id, submenu_id=submenu_id
+    )
+
+
+def parse_key(key: str) -> tuple[str | None, str | None]:
+    """Get ids of menu and submenu the cache key belongs to."""
+    for pattern in (_MENU_KEY, _DISHES_LIST_KEY, _SUBMENUS_LIST_KEY):
+        match = pattern.match(key)
+        if match:
+            groups = match.groupdict()
+            return groups['menu_id'], groups.get('submenu_id')
+    return None, None
+
+
+def key_family(key: str) -> str:
+    """Get name of the group of similar keys, used to label metrics."""
+    for pattern, family in _KEY_FAMILIES:
+        if pattern.match(key):
+            return family
+    return 'other'
+
+
+def menu_tag(menu_id: UUID4 | str) -> str:
+    """Tag of all caches related to the menu."""
+    return menu_key(menu_id)
+
+
+def submenu_tag(menu_id: UUID4 | str, submenu_id: UUID4 | str) -> str:
+    """Tag of all caches related to the submenu."""
+    return submenu_key(menu_id, submenu_id)
+
+
+def menu_responses_tag(menu_id: UUID4 | str) -> str:
+    """Tag of cached responses of the menu and its submenus and dishes."""
+    return f'responses:{menu_key(menu_id)}'
+
+
+def pages_tag(list_key: str) -> str:
+    """Tag of all cached pages of the list, hash-tagged like the pages."""
+    if list_key == LIST_MENUS_KEY:
+        list_key = f'{{{LIST_MENUS_KEY}}}'
+    return f'pages:{list_key}'
+
+
+def key_tags(key: str) -> list[str]:
+    """Get tags of the cache key, from the widest to the narrowest."""
+    menu_id, submenu_id = parse_key(key)
+    tags = []
+    if menu_id is not None:
+        tags.append(menu_tag(menu_id))
+        if submenu_id is not None:
+            tags.append(submenu_tag(menu_id, submenu_id))
+    list_key, page, _ = key.partition(':page-')
+    if page:
+        tags.append(pages_tag(list_key))
+    return tags
+
+
+def tag_set_key(tag: str) -> str:
+    """Name of the Redis set holding keys written under the tag."""
+    return f'tag:{tag}'
+
+
+def generation_key(tag: str) -> str:
+    """Name of the Redis counter holding current generation of the tag."""
+    return f'gen:{tag}'
+
+
+def lock_key(key: str) -> str:
+    """Name of the Redis lock taken while the key is being loaded."""
+    return f'lock:{key}'
@@ -0,0 +1,124 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from src.services.cache_keys import key_family
+
+# Upper bounds of histogram buckets in seconds.
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+COUNTERS = (
+    'hits',
+    'local_hits',
+    'misses',
+    'bytes_read',
+    'bytes_written',
+    'writes',
+    'deletes',
+    'invalidations',
+)
+
+
+class Histogram:
+    """Distribution of durations over fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add duration in seconds."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get cumulative bucket counts, like Prometheus histograms."""
+        cumulative, total = {}, 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            total += count
+            cumulative[str(bound)] = total
+        return {'count': self.count, 'sum': self.sum, 'buckets': cumulative}
+
+
+class CacheMetrics:
+    """Cache counters and latency histograms grouped by key family."""
+
+    def __init__(self) -> None:
+        # Current state values, they are kept on reset.
+        self._gauges: dict[str, Any] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all collected values."""
+        self._counters: defaultdict[str, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(COUNTERS, 0)
+        )
+        self._histograms: defaultdict[
+            tuple[str, str], Histogram
+        ] = defaultdict(Histogram)
+        self._totals: defaultdict[str, int] = defaultdict(int)
+
+    def incr(self, key: str, counter: str, value: int = 1) -> None:
+        """Increase counter of the family of the key."""
+        self._counters[key_family(key)][counter] += value
+
+    def observe(self, key: str, histogram: str, value: float) -> None:
+        """Add duration to histogram of the family of the key."""
+        self._histograms[key_family(key), histogram].observe(value)
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        """Save current value of process-wide metric."""
+        self._gauges[name] = value
+
+    def incr_total(self, name: str, value: int = 1) -> None:
+        """Increase process-wide counter."""
+        self._totals[name] += value
+
+    @contextmanager
+    def timer(self, key: str, histogram: str) -> Iterator[None]:
+        """Measure duration of the block into histogram."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(key, histogram, time.perf_counter() - started)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Get process-wide values and collected values of key families."""
+        families: dict[str, dict[str, Any]] = {}
+        for family, counters in self._counters.items():
+            lookups = counters['hits'] + counters['misses']
+            families[family] = {
+                **counters,
+                'hit_ratio': counters['hits'] / lookups if lookups else None,
+            }
+        for (family, name), histogram in self._histograms.items():
+            families.setdefault(family, dict.fromkeys(COUNTERS, 0))
+            families[family][name] = histogram.snapshot()
+        return {
+            'backend': {**self._gauges, **self._totals},
+            'families': families,
+        }
+
+
+cache_metrics = CacheMetrics()
@@ -0,0 +1,128 @@
+import functools
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel
+
+from src.api.response_models.dish_response import DishResponse
+from src.api.response_models.menu_response import (
+    MenuInfResponse,
+    MenuSummaryResponse,
+)
+from src.api.response_models.submenu_response import SubmenuInfoResponse
+from src.core.settings import settings
+from src.services.cache_keys import (
+    DISH_KEY_TEMPLATE,
+    DISHES_LIST_KEY_TEMPLATE,
+    DISHES_PAGE_KEY_TEMPLATE,
+    LIST_MENUS_KEY,
+    LIST_MENUS_PAGE_KEY_TEMPLATE,
+    MENU_KEY_TEMPLATE,
+    MENU_TREE_KEY_TEMPLATE,
+    MENUS_INDEX_KEY,
+    RESPONSE_KEY_TEMPLATE,
+    SUBMENU_KEY_TEMPLATE,
+    SUBMENUS_LIST_KEY_TEMPLATE,
+    SUBMENUS_PAGE_KEY_TEMPLATE,
+    key_family,
+)
+
+# Fields of policies that can be overridden by CACHE_POLICIES setting.
+TUNABLE_FIELDS = ('lifetime', 'soft_lifetime')
+
+
+class CachePolicy(NamedTuple):
+    """
+    How values of one endpoint are cached. Caches of the dependents are
+    refreshed after writes of the value. Tags of the key follow from the
+    ids of menu and submenu in it. Lifetime of 0 and soft lifetime of
+    None mean the defaults from settings.
+    """
+
+    key_template: str
+    model: type[BaseModel] | None = None
+    lifetime: int = 0
+    soft_lifetime: int | None = None
+    dependents: tuple[str, ...] = ()
+
+    def key(self, **ids: Any) -> str:
+        """Cache key for the ids, ids missing in the template are ignored."""
+        return self.key_template.format(**ids)
+
+
+# Policies are named after key families, so metrics use the same names.
+CACHE_POLICIES = {
+    'menu': CachePolicy(
+        MENU_KEY_TEMPLATE,
+        MenuInfResponse,
+        dependents=('list_menus', 'menus_index', 'menu_tree'),
+    ),
+    'submenu': CachePolicy(
+        SUBMENU_KEY_TEMPLATE,
+        SubmenuInfoResponse,
+        dependents=('submenus_list', 'menu_tree'),
+    ),
+    'dish': CachePolicy(
+        DISH_KEY_TEMPLATE,
+        DishResponse,
+        dependents=('dishes_list', 'menu_tree'),
+    ),
+    'list_menus': CachePolicy(LIST_MENUS_KEY, MenuInfResponse),
+    'menus_index': CachePolicy(MENUS_INDEX_KEY),
+    'menu_tree': CachePolicy(MENU_TREE_KEY_TEMPLATE, MenuSummaryResponse),
+    'submenus_list': CachePolicy(
+        SUBMENUS_LIST_KEY_TEMPLATE, SubmenuInfoResponse
+    ),
+    'dishes_list': CachePolicy(DISHES_LIST_KEY_TEMPLATE, DishResponse),
+    # Pages hold one item more than the limit, to know if there is next.
+    'list_menus_page': CachePolicy(
+        LIST_MENUS_PAGE_KEY_TEMPLATE, MenuInfResponse
+    ),
+    'submenus_page': CachePolicy(
+        SUBMENUS_PAGE_KEY_TEMPLATE, SubmenuInfoResponse
+    ),
+    'dishes_page': CachePolicy(DISHES_PAGE_KEY_TEMPLATE, DishResponse),
+    'response': CachePolicy(RESPONSE_KEY_TEMPLATE),
+}
+
+DEFAULT_POLICY = CachePolicy('{key}')
+
+
+@functools.lru_cache
+def get_cache_policies() -> dict[str, CachePolicy]:
+    """
+    Get policies with lifetimes from settings filled in. Settings do not
+    change at runtime, so they are parsed once per process.
+    """
+    for name, overrides in settings.CACHE_POLICIES.items():
+        if name not in CACHE_POLICIES:
+            raise ValueError(f'Unknown cache policy {name}')
+        unknown_fields = set(overrides) - set(TUNABLE_FIELDS)
+        if unknown_fields:
+            raise ValueError(
+                f'Cache policy {name} has no tunable fields {unknown_fields}'
+            )
+    policies = {}
+    for name, policy in {**CACHE_POLICIES, 'other': DEFAULT_POLICY}.items():
+        if name in settings.CACHE_POLICIES:
+            policy_overrides: dict[str, Any] = settings.CACHE_POLICIES[name]
+            policy = policy._replace(**policy_overrides)
+        lifetime = policy.lifetime or settings.REDIS_CACHE_LIFETIME
+        soft_lifetime = (
+            policy.soft_lifetime or settings.REDIS_CACHE_SOFT_LIFETIME
+        )
+        if soft_lifetime is not None and soft_lifetime >= lifetime:
+            raise ValueError(
+                f'Soft lifetime of cache policy {name} must be less than '
+                'its lifetime'
+            )
+        policies[name] = policy._replace(
+            lifetime=lifetime, soft_lifetime=soft_lifetime
+        )
+    return policies
+
+
+def policy_for_key(
+    policies: dict[str, CachePolicy], key: str
+) -> CachePolicy:
+    """Get policy of the family of the key."""
+    return policies.get(key_family(key), policies['other'])
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRebuilder:
+    """
+    Debounced rebuild of aggregate cache keys after writes. Keys are
+    collected until no write comes for delay seconds, but no longer than
+    max_delay, then all of them are rebuilt at once. A burst of writes,
+    like Excel import, thus causes one rebuild instead of one per write.
+    """
+
+    def __init__(self, delay: float, max_delay: float) -> None:
+        self.delay = delay
+        self.max_delay = max_delay
+        self._rebuild: Callable[[set[str]], Awaitable[None]] | None = None
+        self._pending: set[str] = set()
+        self._rebuilding: set[str] = set()
+        self._first_scheduled = 0.0
+        self._last_scheduled = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._rebuild is not None
+
+    def start(self, rebuild: Callable[[set[str]], Awaitable[None]]) -> None:
+        """Accept keys to rebuild with the given function."""
+        self._rebuild = rebuild
+
+    def schedule(self, keys: list[str]) -> None:
+        """Rebuild keys after the writes are over."""
+        now = asyncio.get_running_loop().time()
+        if not self._pending:
+            self._first_scheduled = now
+        self._pending.update(keys)
+        self._last_scheduled = now
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> list[str]:
+        """Stop accepting keys, return keys that were not rebuilt."""
+        self._rebuild = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending = list(self._pending | self._rebuilding)
+        self._pending, self._rebuilding = set(), set()
+        return pending
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending and self._rebuild is not None:
+            deadline = min(
+                self._last_scheduled + self.delay,
+                self._first_scheduled + self.max_delay,
+            )
+            if loop.time() < deadline:
+                await asyncio.sleep(deadline - loop.time())
+                continue
+            self._rebuilding, self._pending = self._pending, set()
+            try:
+                await self._rebuild(self._rebuilding)
+            except Exception as error:
+                logger.warning(
+                    'Rebuild of caches %s failed: %s', self._rebuilding, error
+                )
+            self._rebuilding = set()
+        self._task = None
+
+
+cache_rebuilder = CacheRebuilder(
+    delay=settings.CACHE_REBUILD_DELAY,
+    max_delay=settings.CACHE_REBUILD_MAX_DELAY,
+)
+
+# Refreshes the catalog view after writes, then caches built from it.
+catalog_view_refresher = CacheRebuilder(
+    delay=settings.CATALOG_VIEW_REFRESH_DELAY,
+    max_delay=settings.CATALOG_VIEW_REFRESH_MAX_DELAY,
+)
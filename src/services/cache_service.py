@@ -1,19 +1,62 @@
+import asyncio
 import functools
-import pickle
-from typing import Union
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any, Union
 
-from pydantic import UUID4
-from redis import asyncio as aioredis
-from redis.asyncio.connection import ConnectionPool
+from fastapi import BackgroundTasks
+from pydantic import UUID4, BaseModel
 
 from src.api.response_models.dish_response import DishResponse
-from src.api.response_models.menu_response import MenuInfResponse, MenuSummaryResponse
-from src.api.response_models.submenu_response import SubmenuInfoResponse
+from src.api.response_models.menu_response import (
+    MenuInfResponse,
+    MenuResponse,
+    MenuSummaryResponse,
+)
+from src.api.response_models.submenu_response import (
+    SubmenuInfoResponse,
+    SubmenuResponse,
+)
+from src.core.exceptions import ObjectNotFoundError
 from src.core.settings import settings
+from src.services import cache_codec
+from src.services.cache_backends import (
+    AbstractCacheBackend,
+    CacheUnavailableError,
+    get_cache_backend,
+)
+from src.services.cache_keys import (
+    CATALOG_VIEW_FAMILIES,
+    LIST_MENUS_KEY,
+    PAGED_LIST_FAMILIES,
+    RESPONSES_LISTS_TAG,
+    RESPONSES_TAG,
+    generation_key,
+    key_family,
+    key_tags,
+    lock_key,
+    menu_key,
+    menu_responses_tag,
+    menu_tag,
+    pages_tag,
+    submenu_key,
+    submenu_tag,
+    submenus_list_key,
+)
+from src.services.cache_metrics import cache_metrics
+from src.services.cache_policies import get_cache_policies, policy_for_key
+from src.services.cache_rebuilder import (
+    cache_rebuilder,
+    catalog_view_refresher,
+)
+from src.services.local_cache import MISSING, local_cache, publish_invalidation
 
 CacheResponseType = Union[
     DishResponse,
+    MenuResponse,
     MenuInfResponse,
+    SubmenuResponse,
     SubmenuInfoResponse,
     list[DishResponse],
     list[MenuInfResponse],
@@ -22,75 +65,514 @@ CacheResponseType = Union[
     None,
 ]
 
+logger = logging.getLogger(__name__)
 
-def with_redis_connection(func):
-    @functools.wraps(func)
-    async def wrapper(self, *args, **kwargs) -> CacheResponseType:
-        redis_conn = await self.get_redis_connection()
-        try:
-            return await func(self, redis_conn, *args, **kwargs)
-        finally:
-            await redis_conn.close()
+# Loads of missing keys running in this process, shared by concurrent readers.
+_inflight_loads: dict[str, asyncio.Future] = {}
+
+
+def bypass_unavailable_cache(
+    fallback: Callable[..., Any] | None = None
+) -> Callable:
+    """
+    Make the method work without unavailable cache backend. Reads return
+    result of fallback called with the method arguments. Skipped writes
+    clear local cache, as it may keep values the write had to replace.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        async def wrapper(
+            self: 'CacheService', *args: Any, **kwargs: Any
+        ) -> Any:
+            try:
+                return await method(self, *args, **kwargs)
+            except CacheUnavailableError as error:
+                logger.debug('Cache bypassed in %s: %s', method.__name__, error)
+                if fallback is not None:
+                    return fallback(*args, **kwargs)
+                if self.local_cache_enabled:
+                    local_cache.clear()
+                return None
 
-    return wrapper
+        return wrapper
+
+    return decorator
 
 
 class CacheService:
     def __init__(self) -> None:
-        self.redis_url: str = settings.redis_url
+        self.backend: AbstractCacheBackend = get_cache_backend()
         self.lifetime: int = settings.REDIS_CACHE_LIFETIME
+        # Process-local backend needs no local cache in front of it.
+        self.local_cache_enabled: bool = (
+            settings.CACHE_L1_ENABLED and settings.CACHE_BACKEND == 'redis'
+        )
+        self.use_generations: bool = (
+            settings.CACHE_INVALIDATION_MODE == 'generations'
+        )
+        self.lock_timeout: float = settings.CACHE_LOCK_TIMEOUT
+        self.lock_wait_timeout: float = settings.CACHE_LOCK_WAIT_TIMEOUT
+        self.lock_poll_interval: float = settings.CACHE_LOCK_POLL_INTERVAL
+        self.not_found_lifetime: int = settings.CACHE_NOT_FOUND_LIFETIME
+        self.compression_threshold: int = settings.CACHE_COMPRESSION_THRESHOLD
+        self.compression_level: int = settings.CACHE_COMPRESSION_LEVEL
+        self.rebuild_aggregates: bool = (
+            settings.CACHE_AGGREGATES_MODE == 'rebuild'
+        )
+        # Lists and trees are read from the catalog view, which lags writes.
+        self.catalog_view_enabled: bool = settings.CATALOG_VIEW_ENABLED
+        # Keys read as missing, so that readers load them again on rebuild.
+        self.reload_keys: set[str] = set()
+        self.policies = get_cache_policies()
 
-    async def get_redis_connection(self) -> aioredis.Redis | None:
-        """Get connection for Redis DB"""
-        pool = ConnectionPool.from_url(self.redis_url)
-        return await aioredis.Redis(connection_pool=pool)
-
-    @with_redis_connection
     async def set_cache(
-        self, redis_conn: aioredis.Redis, key: str, value: bytes
+        self, key: str, value: Any, model: type[BaseModel] | None = None
     ) -> None:
-        """Set cache for object in redis DB."""
-        value = pickle.dumps(value)
-        await redis_conn.set(key, value, ex=self.lifetime)
-
-    @with_redis_connection
-    async def get_cache(
-        self, redis_conn: aioredis.Redis, key: str
-    ) -> CacheResponseType:
-        """Get cache for object in redis DB."""
-        cache = await redis_conn.get(key)
-        if cache:
-            return pickle.loads(cache)
-        return None
-
-    @with_redis_connection
-    async def delete_caches(
-        self, redis_conn: aioredis.Redis, keys: list
+        """
+        Set cache for object in cache backend. ORM objects are stored in the
+        shape of the given response model.
+        """
+        await self.set_many({key: value}, model)
+
+    @bypass_unavailable_cache()
+    async def set_many(
+        self,
+        values: dict[str, Any],
+        model: type[BaseModel] | None = None,
+        lifetime: int | None = None,
+        tagged: bool = True,
     ) -> None:
+        """
+        Set caches for several objects of the same model at once. Untagged
+        values are not deleted with their menu, only by lifetime.
+        """
+        if not values:
+            return
+        keys = list(values)
+        physical_keys = await self._physical_keys(keys)
+        raw_values, tags = {}, {}
+        for key, physical_key in zip(keys, physical_keys):
+            with cache_metrics.timer(key, 'serialization'):
+                raw_values[physical_key] = cache_codec.encode(
+                    values[key],
+                    model,
+                    self.compression_threshold,
+                    self.compression_level,
+                )
+            cache_metrics.incr(key, 'writes')
+            cache_metrics.incr(
+                key, 'bytes_written', len(raw_values[physical_key])
+            )
+            if tagged and not self.use_generations:
+                tags[physical_key] = key_tags(key)
+        if lifetime is None:
+            lifetime = policy_for_key(self.policies, keys[0]).lifetime
+        with cache_metrics.timer(keys[0], 'backend_latency'):
+            # Tag sets must outlive the keys in them, whatever the policy.
+            await self.backend.set_many(
+                raw_values, lifetime, tags, max(lifetime, self.lifetime)
+            )
+        if self.local_cache_enabled:
+            local_cache.delete(physical_keys)
+            await publish_invalidation(keys=physical_keys)
+
+    async def cache_object(self, policy: str, value: Any, **ids: Any) -> None:
+        """Set cache for object under the key and model of the policy."""
+        cache_policy = self.policies[policy]
+        await self.set_cache(
+            cache_policy.key(**ids), value, cache_policy.model
+        )
+
+    async def set_not_found(
+        self, key: str, error: ObjectNotFoundError
+    ) -> None:
+        """
+        Remember for a short time that object does not exist. Creating
+        the object overwrites the key, so the entry needs no cleanup. The
+        entry is not tagged, or probes of random ids would grow tag sets
+        of existing menus without bound.
+        """
+        await self.set_many(
+            {key: cache_codec.NotFound(error.detail)},
+            lifetime=self.not_found_lifetime,
+            tagged=False,
+        )
+
+    async def get_cache(self, key: str) -> CacheResponseType:
+        """
+        Get cache for object from local cache or cache backend. Raise
+        ObjectNotFoundError if the object is remembered as nonexistent.
+        """
+        value, _ = await self._get_entry(key)
+        if isinstance(value, cache_codec.NotFound):
+            raise ObjectNotFoundError(value.detail)
+        return value
+
+    @bypass_unavailable_cache(lambda keys: [None] * len(keys))
+    async def get_many(self, keys: list[str]) -> list[CacheResponseType]:
+        """Get caches for several keys with one MGET, None for misses."""
+        if not keys:
+            return []
+        physical_keys = await self._physical_keys(keys)
+        values: list[CacheResponseType] = [None] * len(keys)
+        remote_positions = []
+        for position, physical_key in enumerate(physical_keys):
+            if keys[position] in self.reload_keys:
+                continue
+            value: Any = (
+                local_cache.get(physical_key)
+                if self.local_cache_enabled
+                else MISSING
+            )
+            if value is MISSING:
+                remote_positions.append(position)
+            else:
+                values[position] = value
+                cache_metrics.incr(keys[position], 'hits')
+                cache_metrics.incr(keys[position], 'local_hits')
+        if remote_positions:
+            remote_keys = [
+                physical_keys[position] for position in remote_positions
+            ]
+            first_key = keys[remote_positions[0]]
+            with cache_metrics.timer(first_key, 'backend_latency'):
+                caches = await self.backend.mget(remote_keys)
+            for position, cache in zip(remote_positions, caches):
+                if not cache:
+                    cache_metrics.incr(keys[position], 'misses')
+                    continue
+                values[position] = self._decode(keys[position], cache)
+                if values[position] is not None and self.local_cache_enabled:
+                    local_cache.set(
+                        physical_keys[position], values[position], len(cache)
+                    )
+        return values
+
+    @bypass_unavailable_cache(lambda key: (None, False))
+    async def _get_entry(self, key: str) -> tuple[CacheResponseType, bool]:
+        """Get cache for object and whether it is older than soft lifetime."""
+        if key in self.reload_keys:
+            return None, False
+        [physical_key] = await self._physical_keys([key])
+        if self.local_cache_enabled:
+            value = local_cache.get(physical_key)
+            if value is not MISSING:
+                cache_metrics.incr(key, 'hits')
+                cache_metrics.incr(key, 'local_hits')
+                return value, False
+        policy = policy_for_key(self.policies, key)
+        # Entries with less time to live than this are served stale.
+        stale_ttl_ms = 0
+        with cache_metrics.timer(key, 'backend_latency'):
+            if policy.soft_lifetime is None:
+                cache, ttl = await self.backend.get(physical_key), None
+            else:
+                cache, ttl = await self.backend.get_with_ttl(physical_key)
+                stale_ttl_ms = (policy.lifetime - policy.soft_lifetime) * 1000
+        if not cache:
+            cache_metrics.incr(key, 'misses')
+            return None, False
+        value = self._decode(key, cache)
+        stale = ttl is not None and 0 <= ttl < stale_ttl_ms
+        if value is not None and not stale and self.local_cache_enabled:
+            local_cache.set(physical_key, value, len(cache))
+        return value, stale
+
+    @staticmethod
+    def _decode(key: str, cache: bytes) -> Any:
+        """Decode cache value read from backend and count it as hit or miss."""
+        with cache_metrics.timer(key, 'serialization'):
+            value = cache_codec.decode(cache)
+        if value is None:
+            cache_metrics.incr(key, 'misses')
+        else:
+            cache_metrics.incr(key, 'hits')
+            cache_metrics.incr(key, 'bytes_read', len(cache))
+        return value
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        model: type[BaseModel] | None = None,
+        background_tasks: BackgroundTasks | None = None,
+    ) -> Any:
+        """
+        Get cache for key, on miss load and cache the value. Concurrent
+        misses of the same key are coalesced, so only one of them calls
+        loader in this process and across workers. Value older than soft
+        lifetime is returned as is and refreshed in background task.
+        Nonexistent objects raise ObjectNotFoundError and are remembered.
+        """
+        cached, stale = await self._get_entry(key)
+        if isinstance(cached, cache_codec.NotFound):
+            raise ObjectNotFoundError(cached.detail)
+        if cached is not None:
+            if stale and background_tasks is not None:
+                background_tasks.add_task(self._refresh, key, loader, model)
+            return cached
+        inflight = _inflight_loads.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(inflight), self.lock_wait_timeout
+                )
+            except asyncio.TimeoutError:
+                return await loader()
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                return await loader()
+        future = asyncio.get_running_loop().create_future()
+        # Mark the exception as retrieved when nobody waits for the load.
+        future.add_done_callback(
+            lambda done: done.cancelled() or done.exception()
+        )
+        _inflight_loads[key] = future
+        try:
+            value = await self._load_once(key, loader, model)
+        except Exception as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if not future.done():
+                future.cancel()
+            del _inflight_loads[key]
+
+    async def get_or_load(
+        self,
+        policy: str,
+        loader: Callable[[], Awaitable[Any]],
+        background_tasks: BackgroundTasks | None = None,
+        **ids: Any,
+    ) -> Any:
+        """Get cache for the key of the policy, on miss load and cache it."""
+        cache_policy = self.policies[policy]
+        return await self.get_or_set(
+            cache_policy.key(**ids),
+            loader,
+            cache_policy.model,
+            background_tasks,
+        )
+
+    async def _load_once(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        model: type[BaseModel] | None,
+    ) -> Any:
+        """Load value under Redis lock or wait for the worker holding it."""
+        try:
+            token = await self._acquire_lock(key)
+        except CacheUnavailableError:
+            return await loader()
+        if token is None and key not in self.reload_keys:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.lock_wait_timeout
+            while loop.time() < deadline and self.backend.available:
+                await asyncio.sleep(self.lock_poll_interval)
+                cached = await self.get_cache(key)
+                if cached is not None:
+                    return cached
+        try:
+            value = await loader()
+            await self.set_cache(key, value, model)
+            return value
+        except ObjectNotFoundError as error:
+            await self.set_not_found(key, error)
+            raise
+        finally:
+            if token is not None:
+                await self._release_lock(key, token)
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        model: type[BaseModel] | None,
+    ) -> None:
+        """Reload stale value unless another worker is already doing it."""
+        try:
+            token = await self._acquire_lock(key)
+        except CacheUnavailableError:
+            return
+        if token is None:
+            return
+        try:
+            await self.set_cache(key, await loader(), model)
+        except Exception as error:
+            logger.warning('Refresh of stale cache %s failed: %s', key, error)
+        finally:
+            await self._release_lock(key, token)
+
+    async def _acquire_lock(self, key: str) -> str | None:
+        """Try to lock loading of the key, return lock token on success."""
+        token = uuid.uuid4().hex
+        locked = await self.backend.acquire_lock(
+            lock_key(key), token, self.lock_timeout
+        )
+        return token if locked else None
+
+    # Lock left in unavailable backend expires after lock timeout.
+    @bypass_unavailable_cache(lambda key, token: None)
+    async def _release_lock(self, key: str, token: str) -> None:
+        """Release lock of the key taken with the token."""
+        await self.backend.release_lock(lock_key(key), token)
+
+    @bypass_unavailable_cache()
+    async def delete_caches(self, keys: list) -> None:
         """Delete multiple caches for given keys."""
-        await redis_conn.delete(*keys)
+        if not keys:
+            return
+        for key in keys:
+            cache_metrics.incr(key, 'deletes')
+        physical_keys = await self._physical_keys(keys)
+        with cache_metrics.timer(keys[0], 'backend_latency'):
+            await self.backend.delete(physical_keys)
+        if self.local_cache_enabled:
+            local_cache.delete(physical_keys)
+            await publish_invalidation(keys=physical_keys)
+
+    async def refresh_aggregates(self, keys: list[str]) -> None:
+        """
+        Update caches of lists and trees after a write: schedule their
+        rebuild in rebuild mode, otherwise delete them. With the catalog
+        view caches loaded from it are kept until the view is refreshed,
+        caches loaded from the old view would be stale.
+        """
+        if self.catalog_view_enabled and catalog_view_refresher.running:
+            view_keys = [
+                key for key in keys if key_family(key) in CATALOG_VIEW_FAMILIES
+            ]
+            if view_keys:
+                catalog_view_refresher.schedule(view_keys)
+            keys = [key for key in keys if key not in view_keys]
+            if not keys:
+                return
+        await self.invalidate_pages(keys)
+        if self.rebuild_aggregates and cache_rebuilder.running:
+            cache_rebuilder.schedule(keys)
+        else:
+            await self.delete_caches(keys)
 
-    @with_redis_connection
-    async def invalidate_cache_for_menu(
-        self, redis_conn: aioredis.Redis, menu_id: UUID4
+    async def invalidate_pages(self, keys: list[str]) -> None:
+        """Delete cached pages of the lists, they are loaded page by page."""
+        for key in keys:
+            if key_family(key) in PAGED_LIST_FAMILIES:
+                await self._invalidate_tag(pages_tag(key))
+
+    async def refresh_dependents(self, policy: str, **ids: Any) -> None:
+        """Refresh caches depending on the object written under the policy."""
+        await self.refresh_aggregates(
+            [
+                self.policies[dependent].key(**ids)
+                for dependent in self.policies[policy].dependents
+            ]
+        )
+        await self.invalidate_responses(ids.get('menu_id'))
+
+    async def refresh_counts(
+        self, menu_id: UUID4, submenu_id: UUID4 | None = None
     ) -> None:
+        """
+        Refresh caches holding counts of the menu and the submenu after
+        their submenus or dishes were created or deleted. Counts are kept
+        by DB triggers, so the caches are loaded again instead of changed.
+        """
+        objects, lists = [menu_key(menu_id)], [LIST_MENUS_KEY]
+        if submenu_id is not None:
+            objects.append(submenu_key(menu_id, submenu_id))
+            lists.append(submenus_list_key(menu_id))
+        await self.delete_caches(objects)
+        await self.refresh_aggregates(lists)
+        await self.invalidate_responses(menu_id)
+
+    async def invalidate_cache_for_menu(self, menu_id: UUID4) -> None:
         """Delete cache for menu and all related submenus and dishes."""
-        keys = await redis_conn.keys(f'menu_id-{menu_id}*')
-        if keys:
-            await redis_conn.delete(*keys)
+        await self._invalidate_tag(menu_tag(menu_id))
+        await self.invalidate_responses(menu_id)
 
-    @with_redis_connection
     async def invalidate_cache_for_submenu(
-        self, redis_conn: aioredis.Redis, menu_id: UUID4, submenu_id: UUID4
+        self, menu_id: UUID4, submenu_id: UUID4
     ) -> None:
         """Delete cache for submenu and all related dishes."""
-        keys = await redis_conn.keys(
-            f'menu_id-{menu_id}:submenu_id-{submenu_id}*'
-        )
-        if keys:
-            await redis_conn.delete(*keys)
+        await self._invalidate_tag(submenu_tag(menu_id, submenu_id))
+        await self.invalidate_responses(menu_id)
 
-    @with_redis_connection
-    async def flush_redis(self, redis_conn: aioredis.Redis) -> None:
+    async def invalidate_responses(self, menu_id: UUID4 | None = None) -> None:
+        """
+        Drop cached responses of the menu and lists of menus, or all cached
+        responses without the menu, if responses are cached.
+        """
+        if not settings.CACHE_RESPONSES_ENABLED:
+            return
+        if menu_id is None:
+            await self.bump_generation(RESPONSES_TAG)
+        else:
+            await self.bump_generation(menu_responses_tag(menu_id))
+            await self.bump_generation(RESPONSES_LISTS_TAG)
+
+    async def flush_cache(self) -> None:
         """Clear all cache."""
-        await redis_conn.flushdb()
+        await self.backend.flush()
+        if self.local_cache_enabled:
+            local_cache.clear()
+            await publish_invalidation(clear=True)
+
+    @bypass_unavailable_cache()
+    async def _invalidate_tag(self, tag: str) -> None:
+        """Delete all caches written under the tag."""
+        cache_metrics.incr(tag, 'invalidations')
+        if self.use_generations:
+            with cache_metrics.timer(tag, 'backend_latency'):
+                await self.bump_generation(tag)
+            return
+        with cache_metrics.timer(tag, 'backend_latency'):
+            keys = await self.backend.invalidate_tag(tag)
+        if self.local_cache_enabled:
+            local_cache.delete(keys)
+            await publish_invalidation(keys=keys)
+
+    @bypass_unavailable_cache()
+    async def bump_generation(self, tag: str) -> None:
+        """Make all caches written under the tag unreachable."""
+        await self.backend.incr(generation_key(tag))
+        if self.local_cache_enabled:
+            local_cache.delete([generation_key(tag)])
+            await publish_invalidation(keys=[generation_key(tag)])
+
+    async def _physical_keys(self, keys: list[str]) -> list[str]:
+        """Embed generations of menu and submenu into the cache keys."""
+        if not self.use_generations:
+            return keys
+        keys_tags = [key_tags(key) for key in keys]
+        generations = await self.get_generations(
+            {tag for tags in keys_tags for tag in tags}
+        )
+        return [
+            key + ''.join(f'@{generations[tag]}' for tag in tags)
+            for key, tags in zip(keys, keys_tags)
+        ]
+
+    async def get_generations(self, tags: set[str]) -> dict[str, int]:
+        """Get current generations of tags, unknown tags have generation 0."""
+        generations = {}
+        if self.local_cache_enabled:
+            for tag in tags:
+                generation = local_cache.get(generation_key(tag))
+                if generation is not MISSING:
+                    generations[tag] = generation
+        missing_tags = [tag for tag in tags if tag not in generations]
+        if missing_tags:
+            values = await self.backend.mget(
+                [generation_key(tag) for tag in missing_tags]
+            )
+            for tag, value in zip(missing_tags, values):
+                generations[tag] = int(value or 0)
+                if self.local_cache_enabled:
+                    local_cache.set(generation_key(tag), generations[tag], 8)
+        return generations
@@ -1,3 +1,4 @@
+import functools
 from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends
@@ -6,7 +7,9 @@ from starlette.responses import JSONResponse
 from src.api.request_models.request_base import DishRequest
 from src.api.response_models.dish_response import DishResponse
 from src.repositories.dishes_repository import DishRepository
+from src.services.cache_keys import dish_key
 from src.services.cache_service import CacheService
+from src.services.pagination import split_page
 
 
 class DishService:
@@ -27,17 +30,19 @@ class DishService:
     ) -> DishResponse:
         """Service function for creation object dish and saving cache."""
         dish = await self._dish_repository.create_dish_db(submenu_id, schema)
-        await self._cache_service.set_cache(
-            f'menu_id-{menu_id}:submenu_id-{submenu_id}:dish_id-{dish.id}',
+        await self._cache_service.cache_object(
+            'dish',
             dish,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dish_id=dish.id,
         )
+        await self._cache_service.refresh_counts(menu_id, submenu_id)
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches,
-            [
-                f'submenus_list_{menu_id}',
-                f'dishes_list_{menu_id}_{submenu_id}',
-                'all_menus'
-            ],
+            self._cache_service.refresh_dependents,
+            'dish',
+            menu_id=menu_id,
+            submenu_id=submenu_id,
         )
         return dish
 
@@ -50,13 +55,18 @@ class DishService:
     ) -> DishResponse:
         """Service function for updating object dish and saving cache."""
         dish = await self._dish_repository.update_dish_db(dish_id, schema)
-        await self._cache_service.set_cache(
-            f'menu_id-{menu_id}:submenu_id-{submenu_id}:dish_id-{dish.id}',
+        await self._cache_service.cache_object(
+            'dish',
             dish,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dish_id=dish.id,
         )
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches,
-            [f'dishes_list_{menu_id}_{submenu_id}', 'all_menus'],
+            self._cache_service.refresh_dependents,
+            'dish',
+            menu_id=menu_id,
+            submenu_id=submenu_id,
         )
         return dish
 
@@ -64,31 +74,45 @@ class DishService:
         self, menu_id: UUID, submenu_id: UUID, dish_id: UUID
     ) -> DishResponse:
         """Service function for get object dish from DB or redis cache."""
-        cached_dish = await self._cache_service.get_cache(
-            f'menu_id-{menu_id}:submenu_id-{submenu_id}:dish_id-{dish_id}'
+        return await self._cache_service.get_or_load(
+            'dish',
+            functools.partial(self._dish_repository.get_dish_db, dish_id),
+            self.__background_tasks,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dish_id=dish_id,
         )
-        if cached_dish:
-            return cached_dish
-        dish = await self._dish_repository.get_dish_db(dish_id)
-        await self._cache_service.set_cache(dish_id, dish)
-        return dish
 
     async def delete_dish(
         self, menu_id: UUID, submenu_id: UUID, dish_id: UUID
     ) -> JSONResponse:
-        """Service function for delete object dish from DB and redis cache."""
+        """
+        Service function for delete object dish from DB and redis cache.
+        Caches of the submenu owning the dish are refreshed, which may be
+        not the submenu of the URL.
+        """
+        owner_menu_id, owner_submenu_id = (
+            await self._dish_repository.get_dish_parent_ids_db(dish_id)
+        )
         self.__background_tasks.add_task(
             self._cache_service.delete_caches,
-            [
-                f'menu_id-{menu_id}:submenu_id-{submenu_id}:dish_id-{dish_id}',
-                f'dishes_list_{menu_id}_{submenu_id}',
-                'all_menus'
-            ],
+            list(
+                {
+                    dish_key(menu_id, submenu_id, dish_id),
+                    dish_key(owner_menu_id, owner_submenu_id, dish_id),
+                }
+            ),
+        )
+        self.__background_tasks.add_task(
+            self._cache_service.refresh_dependents,
+            'dish',
+            menu_id=owner_menu_id,
+            submenu_id=owner_submenu_id,
         )
         self.__background_tasks.add_task(
-            self._cache_service.invalidate_cache_for_submenu,
-            menu_id,
-            submenu_id,
+            self._cache_service.refresh_counts,
+            owner_menu_id,
+            owner_submenu_id,
         )
         delete_dish_from_db = await self._dish_repository.delete_dish_db(
             dish_id
@@ -99,13 +123,42 @@ class DishService:
         self, menu_id: UUID, submenu_id: UUID
     ) -> list[DishResponse]:
         """Service function for get list of dishes from DB or redis cache."""
-        cache_key = f'dishes_list_{menu_id}_{submenu_id}'
-        cached_dishes = await self._cache_service.get_cache(cache_key)
+        return await self._cache_service.get_or_load(
+            'dishes_list',
+            functools.partial(
+                self._dish_repository.get_list_of_dishes_db,
+                menu_id,
+                submenu_id,
+            ),
+            self.__background_tasks,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+        )
 
-        if cached_dishes:
-            return cached_dishes
-        dishes_response = await self._dish_repository.get_list_of_dishes_db(
-            menu_id, submenu_id
+    async def get_dishes_page(
+        self,
+        menu_id: UUID,
+        submenu_id: UUID,
+        limit: int,
+        cursor: UUID | None,
+    ) -> tuple[list[DishResponse], UUID | None]:
+        """
+        Service function for get a page of dishes after the cursor and the
+        cursor of the next page. Pages are cached separately.
+        """
+        dishes = await self._cache_service.get_or_load(
+            'dishes_page',
+            functools.partial(
+                self._dish_repository.get_list_of_dishes_db,
+                menu_id,
+                submenu_id,
+                limit + 1,
+                cursor,
+            ),
+            self.__background_tasks,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            limit=limit,
+            cursor=cursor or 'start',
         )
-        await self._cache_service.set_cache(cache_key, dishes_response)
-        return dishes_response
+        return split_page(dishes, limit)
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from src.core.settings import settings
+from src.db.redis_pool import get_pubsub_redis
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+
+class LocalCache:
+    """In-process LRU cache with TTL, bounded by entries and bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Approximate size of cached values in bytes."""
+        return self._size
+
+    def get(self, key: str) -> Any:
+        """Get value by key, return MISSING if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        value, _, expires_at = entry
+        if expires_at < time.monotonic():
+            self._pop(key)
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, size: int) -> None:
+        """Save value with its serialized size, evict least recently used."""
+        self._pop(key)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size, time.monotonic() + self.ttl)
+        self._size += size
+        while self._overflows():
+            oldest_key = next(iter(self._entries))
+            self._pop(oldest_key)
+
+    def delete(self, keys: list[str]) -> None:
+        """Delete values for given keys."""
+        for key in keys:
+            self._pop(key)
+
+    def clear(self) -> None:
+        """Delete all values."""
+        self._entries.clear()
+        self._size = 0
+
+    def _overflows(self) -> bool:
+        entries_exceeded = len(self._entries) > self.max_entries
+        return entries_exceeded or self._size > self.max_bytes
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+local_cache = LocalCache(
+    max_entries=settings.CACHE_L1_MAX_ENTRIES,
+    max_bytes=settings.CACHE_L1_MAX_BYTES,
+    ttl=settings.CACHE_L1_TTL,
+)
+
+WORKER_ID = uuid.uuid4().hex
+_listener_task: asyncio.Task | None = None
+
+
+async def publish_invalidation(
+    keys: list[str] | None = None, clear: bool = False
+) -> None:
+    """
+    Notify other workers that their local cache entries are stale. Lost
+    notification is only logged, the entries expire after local TTL.
+    """
+    message = {
+        'origin': WORKER_ID,
+        'keys': keys or [],
+        'clear': clear,
+    }
+    try:
+        await asyncio.wait_for(
+            get_pubsub_redis().publish(
+                settings.CACHE_INVALIDATION_CHANNEL, json.dumps(message)
+            ),
+            settings.CACHE_CALL_TIMEOUT,
+        )
+    except (RedisError, OSError, asyncio.TimeoutError) as error:
+        logger.warning('Cache invalidation was not published: %s', error)
+
+
+def apply_invalidation(message: dict) -> None:
+    """Drop local cache entries listed in invalidation message."""
+    if message.get('origin') == WORKER_ID:
+        return
+    if message.get('clear'):
+        local_cache.clear()
+        return
+    local_cache.delete(message.get('keys', []))
+
+
+async def _listen_invalidations() -> None:
+    while True:
+        pubsub = get_pubsub_redis().pubsub()
+        try:
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            # Messages could be lost while we were not subscribed.
+            local_cache.clear()
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message is not None:
+                    apply_invalidation(json.loads(message['data']))
+        except asyncio.CancelledError:
+            raise
+        except (RedisError, OSError, ValueError) as error:
+            logger.warning('Cache invalidation listener failed: %s', error)
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.close()
+
+
+async def start_invalidation_listener() -> None:
+    """Subscribe to invalidations of other workers on application startup."""
+    global _listener_task
+    enabled = settings.CACHE_L1_ENABLED and settings.CACHE_BACKEND == 'redis'
+    if enabled and _listener_task is None:
+        _listener_task = asyncio.create_task(_listen_invalidations())
+
+
+async def stop_invalidation_listener() -> None:
+    """Stop listening for invalidations on application shutdown."""
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
@@ -1,12 +1,23 @@
+import functools
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends
 from starlette.responses import JSONResponse
 
 from src.api.request_models.request_base import MenuRequest
-from src.api.response_models.menu_response import MenuInfResponse, MenuSummaryResponse
+from src.api.response_models.menu_response import (
+    MenuInfResponse,
+    MenuSummaryResponse,
+)
 from src.repositories.menus_repository import MenuRepository
+from src.services.cache_keys import (
+    LIST_MENUS_KEY,
+    menu_tree_key,
+    submenus_list_key,
+)
 from src.services.cache_service import CacheService
+from src.services.pagination import split_page
 
 
 class MenuService:
@@ -25,9 +36,9 @@ class MenuService:
     async def create_menu(self, schema: MenuRequest) -> MenuInfResponse:
         """Service function for creation object menu and saving cache."""
         menu = await self._menu_repository.create_menu_db(schema)
-        await self._cache_service.set_cache(f'menu_id-{menu.id}', menu)
+        await self._cache_service.cache_object('menu', menu, menu_id=menu.id)
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches, ['list_menus', 'all_menus']
+            self._cache_service.refresh_dependents, 'menu', menu_id=menu.id
         )
         return menu
 
@@ -36,20 +47,25 @@ class MenuService:
     ) -> MenuInfResponse:
         """Service function for update object menu and saving cache."""
         menu = await self._menu_repository.update_menu_db(menu_id, schema)
-        await self._cache_service.set_cache(f'menu_id-{menu.id}', menu)
+        await self._cache_service.cache_object('menu', menu, menu_id=menu.id)
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches, ['list_menus', 'all_menus']
+            self._cache_service.refresh_dependents, 'menu', menu_id=menu.id
         )
         return menu
 
     async def get_menu(self, menu_id: UUID) -> MenuInfResponse:
-        """Service function for get object menu from DB or redis cache."""
-        cached_menu = await self._cache_service.get_cache(f'menu_id-{menu_id}')
-        if cached_menu is None or not hasattr(cached_menu, 'submenus_count'):
-            menu = await self._menu_repository.get_menu_db_with_counts(menu_id)
-            await self._cache_service.set_cache(f'menu_id-{menu.id}', menu)
-            return menu
-        return cached_menu
+        """
+        Service function for get object menu from DB or redis cache. Menu
+        is cached with counts, writes of its submenus and dishes drop it.
+        """
+        return await self._cache_service.get_or_load(
+            'menu',
+            functools.partial(
+                self._menu_repository.get_menu_db_with_counts, menu_id
+            ),
+            self.__background_tasks,
+            menu_id=menu_id,
+        )
 
     async def delete_menu(self, menu_id: UUID) -> JSONResponse:
         """Service function for delete object menu from DB and redis cache."""
@@ -57,7 +73,7 @@ class MenuService:
             self._cache_service.invalidate_cache_for_menu, menu_id
         )
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches, ['list_menus', 'all_menus']
+            self._cache_service.refresh_dependents, 'menu', menu_id=menu_id
         )
         delete_menu_from_db = await self._menu_repository.delete_menu_db(
             menu_id
@@ -66,18 +82,85 @@ class MenuService:
 
     async def get_menus(self) -> list[MenuInfResponse]:
         """Service function for get list of menus from DB or redis cache."""
-        cached_menus = await self._cache_service.get_cache('list_menus')
+        return await self._cache_service.get_or_load(
+            'list_menus',
+            self._menu_repository.get_list_of_menus_db,
+            self.__background_tasks,
+        )
 
-        if cached_menus:
-            return cached_menus
-        menus_response = await self._menu_repository.get_list_of_menus_db()
-        await self._cache_service.set_cache('list_menus', menus_response)
-        return menus_response
+    async def get_menus_page(
+        self, limit: int, cursor: UUID | None
+    ) -> tuple[list[MenuInfResponse], UUID | None]:
+        """
+        Service function for get a page of menus after the cursor and the
+        cursor of the next page. Pages are cached separately.
+        """
+        menus = await self._cache_service.get_or_load(
+            'list_menus_page',
+            functools.partial(
+                self._menu_repository.get_list_of_menus_db,
+                limit + 1,
+                cursor,
+            ),
+            self.__background_tasks,
+            limit=limit,
+            cursor=cursor or 'start',
+        )
+        return split_page(menus, limit)
+
+    async def reconcile_counters(self) -> dict[str, int]:
+        """
+        Fix counts of submenus and dishes kept in DB, then refresh caches
+        of menus and submenus holding the old counts.
+        """
+        await self._menu_repository.reconcile_counts_db()
+        menus = await self._menu_repository.get_list_of_menus_db()
+        for menu in menus:
+            await self._cache_service.invalidate_cache_for_menu(menu.id)
+        await self._cache_service.refresh_aggregates(
+            [LIST_MENUS_KEY, *(submenus_list_key(menu.id) for menu in menus)]
+        )
+        return {
+            'menus': len(menus),
+            'submenus': sum(menu.submenus_count or 0 for menu in menus),
+        }
 
     async def full_menus(self) -> list[MenuSummaryResponse]:
-        cached_full_menus = await self._cache_service.get_cache('all_menus')
-        if cached_full_menus:
-            return cached_full_menus
-        full_menus_response = await self._menu_repository.get_full_menus_info_db()
-        await self._cache_service.set_cache('all_menus', full_menus_response)
-        return full_menus_response
+        """
+        Service function for get all menus with submenus and dishes. Each
+        menu is cached separately, so a change rebuilds only its menu.
+        """
+        menu_ids = await self._cache_service.get_or_load(
+            'menus_index', self._get_menu_ids, self.__background_tasks
+        )
+        cached_menus = await self._cache_service.get_many(
+            [menu_tree_key(menu_id) for menu_id in menu_ids]
+        )
+        menus = dict(zip(menu_ids, cached_menus))
+        missing_ids = [
+            menu_id for menu_id, menu in menus.items() if menu is None
+        ]
+        if missing_ids:
+            loaded_menus = await self._menu_repository.get_full_menus_info_db(
+                [UUID(menu_id) for menu_id in missing_ids]
+            )
+            await self._cache_service.set_many(
+                {menu_tree_key(menu.id): menu for menu in loaded_menus},
+                MenuSummaryResponse,
+            )
+            menus.update((str(menu.id), menu) for menu in loaded_menus)
+        # Menus deleted after the index was cached are skipped.
+        return [menu for menu in menus.values() if menu is not None]
+
+    def full_menus_json(self) -> AsyncIterator[bytes]:
+        """
+        Service function for get all menus with submenus and dishes as
+        JSON built by DB. Bypasses the cache, for catalogs where loading
+        of ORM objects costs more than reading the cached trees.
+        """
+        return self._menu_repository.stream_full_menus_json_db()
+
+    async def _get_menu_ids(self) -> list[str]:
+        """Get ids of all menus in the order of the cached index."""
+        menu_ids = await self._menu_repository.get_menu_ids_db()
+        return [str(menu_id) for menu_id in menu_ids]
@@ -0,0 +1,21 @@
+from typing import Protocol, TypeVar
+from uuid import UUID
+
+
+class HasID(Protocol):
+    id: UUID
+
+
+Item = TypeVar('Item', bound=HasID)
+
+
+def split_page(
+    items: list[Item], limit: int
+) -> tuple[list[Item], UUID | None]:
+    """
+    Split items loaded with one extra item into the page and the cursor
+    of the next page, None on the last page.
+    """
+    if len(items) > limit:
+        return items[:limit], items[limit - 1].id
+    return items, None
@@ -1,3 +1,4 @@
+import functools
 from uuid import UUID
 
 from fastapi import BackgroundTasks, Depends
@@ -5,8 +6,11 @@ from starlette.responses import JSONResponse
 
 from src.api.request_models.request_base import MenuRequest
 from src.api.response_models.submenu_response import SubmenuInfoResponse
+from src.core.exceptions import ObjectNotFoundError
 from src.repositories.submenus_repository import SubmenuRepository
+from src.services.cache_keys import submenu_key
 from src.services.cache_service import CacheService
+from src.services.pagination import split_page
 
 
 class SubmenuService:
@@ -29,11 +33,12 @@ class SubmenuService:
         submenu = await self._submenus_repository.create_submenu_db(
             menu_id, schema
         )
-        await self._cache_service.set_cache(
-            f'menu_id-{menu_id}:submenu_id-{submenu.id}', submenu
+        await self._cache_service.cache_object(
+            'submenu', submenu, menu_id=menu_id, submenu_id=submenu.id
         )
+        await self._cache_service.refresh_counts(menu_id)
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches, [f'submenus_list_{menu_id}', 'all_menus']
+            self._cache_service.refresh_dependents, 'submenu', menu_id=menu_id
         )
         return submenu
 
@@ -44,51 +49,64 @@ class SubmenuService:
         submenu = await self._submenus_repository.update_submenu_db(
             submenu_id, schema
         )
-        await self._cache_service.set_cache(
-            f'menu_id-{submenu.menu_id}:submenu_id-{submenu.id}', submenu
+        await self._cache_service.cache_object(
+            'submenu', submenu, menu_id=submenu.menu_id, submenu_id=submenu.id
         )
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches,
-            [f'submenus_list_{submenu.menu_id}', 'all_menus'],
+            self._cache_service.refresh_dependents,
+            'submenu',
+            menu_id=submenu.menu_id,
         )
         return submenu
 
     async def get_submenu(
         self, menu_id: UUID, submenu_id: UUID
     ) -> SubmenuInfoResponse:
-        """Service function for get object submenu from DB or redis cache."""
-        cached_submenu = await self._cache_service.get_cache(
-            f'menu_id-{menu_id}:submenu_id-{submenu_id}'
-        )
-        if cached_submenu is None or not hasattr(
-            cached_submenu, 'dishes_count'
-        ):
+        """
+        Service function for get object submenu from DB or redis cache.
+        Submenu is cached with count of dishes, writes of dishes drop it.
+        """
+        key = submenu_key(menu_id, submenu_id)
+        cached_submenu = await self._cache_service.get_cache(key)
+        if isinstance(cached_submenu, SubmenuInfoResponse):
+            return cached_submenu
+        try:
             submenu = (
                 await self._submenus_repository.get_submenu_with_count_db(
                     submenu_id
                 )
             )
-            await self._cache_service.set_cache(
-                f'menu_id-{submenu.menu_id}:submenu_id-{submenu.id}', submenu
-            )
-            return submenu
-        return cached_submenu
+        except ObjectNotFoundError as error:
+            await self._cache_service.set_not_found(key, error)
+            raise
+        # Submenus are cached only under the key of their own menu.
+        await self._cache_service.cache_object(
+            'submenu', submenu, menu_id=submenu.menu_id, submenu_id=submenu.id
+        )
+        return submenu
 
     async def delete_submenu(
         self, menu_id: UUID, submenu_id: UUID
     ) -> JSONResponse:
-        """Service function for delete object submenu from DB and redis cache."""
-        self.__background_tasks.add_task(
-            self._cache_service.invalidate_cache_for_menu, menu_id
-        )
+        """
+        Service function for delete object submenu from DB and redis cache.
+        Caches of the menu owning the submenu are refreshed, which may be
+        not the menu of the URL.
+        """
+        submenu = await self._submenus_repository.get_submenu_db(submenu_id)
+        for owner_id in {menu_id, submenu.menu_id}:
+            self.__background_tasks.add_task(
+                self._cache_service.invalidate_cache_for_submenu,
+                owner_id,
+                submenu_id,
+            )
         self.__background_tasks.add_task(
-            self._cache_service.invalidate_cache_for_submenu,
-            menu_id,
-            submenu_id,
+            self._cache_service.refresh_dependents,
+            'submenu',
+            menu_id=submenu.menu_id,
         )
         self.__background_tasks.add_task(
-            self._cache_service.delete_caches,
-            [f'submenus_list_{menu_id}', 'all_menus'],
+            self._cache_service.refresh_counts, submenu.menu_id
         )
         delete_submenu_from_db = (
             await self._submenus_repository.delete_submenu_db(submenu_id)
@@ -97,13 +115,33 @@ class SubmenuService:
 
     async def get_submenus(self, menu_id: UUID) -> list[SubmenuInfoResponse]:
         """Service function for get list of submenus from DB or redis cache."""
-        cache_key = f'submenus_list_{menu_id}'
-        cached_submenus = await self._cache_service.get_cache(cache_key)
+        return await self._cache_service.get_or_load(
+            'submenus_list',
+            functools.partial(
+                self._submenus_repository.get_list_of_submenus_db, menu_id
+            ),
+            self.__background_tasks,
+            menu_id=menu_id,
+        )
 
-        if cached_submenus:
-            return cached_submenus
-        submenus_response = (
-            await self._submenus_repository.get_list_of_submenus_db(menu_id)
+    async def get_submenus_page(
+        self, menu_id: UUID, limit: int, cursor: UUID | None
+    ) -> tuple[list[SubmenuInfoResponse], UUID | None]:
+        """
+        Service function for get a page of submenus after the cursor and
+        the cursor of the next page. Pages are cached separately.
+        """
+        submenus = await self._cache_service.get_or_load(
+            'submenus_page',
+            functools.partial(
+                self._submenus_repository.get_list_of_submenus_db,
+                menu_id,
+                limit + 1,
+                cursor,
+            ),
+            self.__background_tasks,
+            menu_id=menu_id,
+            limit=limit,
+            cursor=cursor or 'start',
         )
-        await self._cache_service.set_cache(cache_key, submenus_response)
-        return submenus_response
+        return split_page(submenus, limit)
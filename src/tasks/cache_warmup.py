@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+from uuid import UUID
+
+from fastapi import BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+from src.db.db import SessionLocal
+from src.repositories.dishes_repository import DishRepository
+from src.repositories.menus_repository import MenuRepository
+from src.repositories.submenus_repository import SubmenuRepository
+from src.services.cache_backends import close_cache_backend
+from src.services.cache_keys import key_family, parse_key
+from src.services.cache_rebuilder import cache_rebuilder
+from src.services.cache_service import CacheService
+from src.services.dishes_service import DishService
+from src.services.menus_service import MenuService
+from src.services.submenus_service import SubmenuService
+
+logger = logging.getLogger(__name__)
+
+Result = TypeVar('Result')
+
+
+class CacheWarmer:
+    """
+    Fill cache of hot read paths: list of menus, full menus tree and
+    lists of submenus and dishes. Reads go through the services, so the
+    keys and values are the same as for API requests. The same reads
+    rebuild caches of lists and trees after writes.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._reload_keys: set[str] = set()
+
+    async def warm_up(self) -> dict[str, int]:
+        """Warm up the cache, return number of warmed lists."""
+        menus = await self._warm_up_menus()
+        await self._warm_up_menus_tree()
+        submenus_lists = await asyncio.gather(
+            *(self._warm_up_submenus(menu.id) for menu in menus)
+        )
+        dishes_lists = [
+            (menu.id, submenu.id)
+            for menu, submenus in zip(menus, submenus_lists)
+            for submenu in submenus
+        ]
+        await asyncio.gather(
+            *(
+                self._warm_up_dishes(menu_id, submenu_id)
+                for menu_id, submenu_id in dishes_lists
+            )
+        )
+        return {
+            'menus': len(menus),
+            'submenus_lists': len(submenus_lists),
+            'dishes_lists': len(dishes_lists),
+        }
+
+    async def rebuild(self, keys: set[str]) -> None:
+        """Load the lists and trees of the keys from DB and cache them."""
+        self._reload_keys = keys
+        reads = []
+        for key in keys:
+            family = key_family(key)
+            menu_id, submenu_id = parse_key(key)
+            if family == 'list_menus':
+                reads.append(self._warm_up_menus())
+            elif family == 'submenus_list':
+                reads.append(self._warm_up_submenus(UUID(menu_id)))
+            elif family == 'dishes_list':
+                reads.append(
+                    self._warm_up_dishes(UUID(menu_id), UUID(submenu_id))
+                )
+        if {'menus_index', 'menu_tree'} & {key_family(key) for key in keys}:
+            reads.append(self._warm_up_menus_tree())
+        await asyncio.gather(*reads)
+
+    async def _warm_up_menus(self) -> list:
+        return await self._run(
+            lambda session, tasks: MenuService(
+                tasks, MenuRepository(session), self._cache_service()
+            ).get_menus()
+        )
+
+    async def _warm_up_menus_tree(self) -> list:
+        return await self._run(
+            lambda session, tasks: MenuService(
+                tasks, MenuRepository(session), self._cache_service()
+            ).full_menus()
+        )
+
+    async def _warm_up_submenus(self, menu_id: UUID) -> list:
+        return await self._run(
+            lambda session, tasks: SubmenuService(
+                tasks, SubmenuRepository(session), self._cache_service()
+            ).get_submenus(menu_id)
+        )
+
+    async def _warm_up_dishes(self, menu_id: UUID, submenu_id: UUID) -> list:
+        return await self._run(
+            lambda session, tasks: DishService(
+                tasks, DishRepository(session), self._cache_service()
+            ).get_dishes(menu_id, submenu_id)
+        )
+
+    def _cache_service(self) -> CacheService:
+        cache_service = CacheService()
+        cache_service.reload_keys = self._reload_keys
+        return cache_service
+
+    async def _run(
+        self,
+        read: Callable[[AsyncSession, BackgroundTasks], Awaitable[Result]],
+    ) -> Result:
+        """Run read in own DB session, then its background refreshes."""
+        async with self._semaphore, SessionLocal() as session:
+            background_tasks = BackgroundTasks()
+            result = await read(session, background_tasks)
+            await background_tasks()
+            return result
+
+
+async def warm_up_cache() -> dict[str, int]:
+    """Warm up the cache with concurrency from settings."""
+    return await CacheWarmer(settings.CACHE_WARMUP_CONCURRENCY).warm_up()
+
+
+async def warm_up_cache_on_startup() -> None:
+    """
+    Warm up the cache before the worker starts serving requests, if
+    enabled. Failure is logged and does not prevent the start.
+    """
+    if not settings.CACHE_WARMUP_ON_STARTUP:
+        return
+    try:
+        warmed = await warm_up_cache()
+    except Exception as error:
+        logger.warning('Cache warm-up failed: %s', error)
+    else:
+        logger.info('Cache warmed up: %s', warmed)
+
+
+async def rebuild_cache(keys: set[str]) -> None:
+    """Rebuild caches of the keys, delete them if the rebuild fails."""
+    try:
+        await CacheWarmer(settings.CACHE_WARMUP_CONCURRENCY).rebuild(keys)
+    except Exception:
+        await CacheService().delete_caches(list(keys))
+        raise
+    finally:
+        # Responses cached before the rebuild were built from old lists.
+        await CacheService().invalidate_responses()
+
+
+async def start_cache_rebuilder() -> None:
+    """Rebuild caches of lists and trees after writes, if enabled."""
+    if settings.CACHE_AGGREGATES_MODE == 'rebuild':
+        cache_rebuilder.start(rebuild_cache)
+
+
+async def stop_cache_rebuilder() -> None:
+    """Delete caches left not rebuilt, so they are not served stale."""
+    await CacheService().delete_caches(await cache_rebuilder.stop())
+
+
+async def main() -> None:
+    try:
+        print(await warm_up_cache())
+    finally:
+        await close_cache_backend()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
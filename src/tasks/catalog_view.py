@@ -0,0 +1,70 @@
+import logging
+
+from src.core.settings import settings
+from src.db.db import SessionLocal
+from src.repositories.menus_repository import MenuRepository
+from src.services.cache_keys import LIST_MENUS_KEY, parse_key, submenus_list_key
+from src.services.cache_rebuilder import catalog_view_refresher
+from src.services.cache_service import CacheService
+from src.tasks.cache_warmup import rebuild_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_catalog_view_db() -> None:
+    """Refresh the catalog view in own DB session."""
+    async with SessionLocal() as session:
+        await MenuRepository(session).refresh_catalog_view_db()
+
+
+def _stale_keys(keys: set[str]) -> set[str]:
+    """
+    Get caches to refresh after the view: the written ones and lists
+    with counts of their menus.
+    """
+    menu_ids = {
+        menu_id for menu_id, _ in map(parse_key, keys) if menu_id is not None
+    }
+    stale_keys = keys | {LIST_MENUS_KEY}
+    stale_keys.update(submenus_list_key(menu_id) for menu_id in menu_ids)
+    return stale_keys
+
+
+async def refresh_catalog_view(keys: set[str]) -> None:
+    """
+    Refresh the catalog view, then caches of lists and trees. Responses
+    cached after the writes were built from the old view too.
+    """
+    await refresh_catalog_view_db()
+    keys = _stale_keys(keys)
+    await CacheService().invalidate_pages(list(keys))
+    if settings.CACHE_AGGREGATES_MODE == 'rebuild':
+        # The rebuild drops cached responses itself.
+        await rebuild_cache(keys)
+    else:
+        await CacheService().delete_caches(list(keys))
+        await CacheService().invalidate_responses()
+
+
+async def start_catalog_view_refresher() -> None:
+    """
+    Refresh the catalog view after writes, if enabled. The view may be
+    behind writes made while it was disabled, so it is refreshed first.
+    """
+    if not settings.CATALOG_VIEW_ENABLED:
+        return
+    try:
+        await refresh_catalog_view_db()
+    except Exception as error:
+        logger.warning('Refresh of catalog view failed: %s', error)
+    catalog_view_refresher.start(refresh_catalog_view)
+
+
+async def stop_catalog_view_refresher() -> None:
+    """Refresh the view and drop caches of writes left not refreshed."""
+    keys = await catalog_view_refresher.stop()
+    if keys:
+        await refresh_catalog_view_db()
+        stale_keys = list(_stale_keys(set(keys)))
+        await CacheService().invalidate_pages(stale_keys)
+        await CacheService().delete_caches(stale_keys)
@@ -0,0 +1,31 @@
+import asyncio
+
+from fastapi import BackgroundTasks
+
+from src.db.db import SessionLocal
+from src.repositories.menus_repository import MenuRepository
+from src.services.cache_backends import close_cache_backend
+from src.services.cache_service import CacheService
+from src.services.menus_service import MenuService
+
+
+async def reconcile_counters() -> dict[str, int]:
+    """
+    Fix counts of submenus and dishes kept in DB by triggers, like after
+    writes with triggers disabled, then drop caches with the old counts.
+    """
+    async with SessionLocal() as session:
+        return await MenuService(
+            BackgroundTasks(), MenuRepository(session), CacheService()
+        ).reconcile_counters()
+
+
+async def main() -> None:
+    try:
+        print(await reconcile_counters())
+    finally:
+        await close_cache_backend()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
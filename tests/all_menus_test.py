@@ -1,5 +1,7 @@
 from httpx import AsyncClient
 
+from src.core.settings import settings
+
 
 class TestDataGenerator:
     async def generate_test_data(
@@ -77,3 +79,39 @@ async def test_check_all_menus(ac: AsyncClient, clear_db) -> None:
     assert str(received_dish['price']) == expected_dish['price']
 
     await ac.delete(f"/api/v1/menus/{received_menu['id']}")
+
+
+async def test_json_agg_menus_info_matches_orm(
+    ac: AsyncClient, clear_db, monkeypatch
+) -> None:
+    data_generator = TestDataGenerator()
+    menu, _, _ = await data_generator.generate_test_data(
+        ac,
+        {'title': 'Menu', 'description': 'Menu Description'},
+        {'title': 'Submenu', 'description': 'Submenu Description'},
+        {'title': 'Dish', 'description': 'Dish Description', 'price': 10.5},
+    )
+    await ac.post(
+        f"/api/v1/menus/{menu['id']}/submenus/",
+        json={'title': 'Empty Submenu', 'description': 'No dishes'},
+    )
+    await ac.post(
+        '/api/v1/menus/', json={'title': 'Empty Menu', 'description': 'Empty'}
+    )
+
+    orm_response = await ac.get('/api/v1/menus/menus_info/')
+    monkeypatch.setattr(settings, 'MENUS_INFO_MODE', 'json_agg')
+    response = await ac.get('/api/v1/menus/menus_info/')
+    assert response.status_code == 200
+
+    def by_id(items: list[dict]) -> dict:
+        return {
+            item['id']: {
+                **item,
+                'submenus': by_id(item.get('submenus', [])),
+                'dishes': by_id(item.get('dishes', [])),
+            }
+            for item in items
+        }
+
+    assert by_id(response.json()) == by_id(orm_response.json())
@@ -0,0 +1,88 @@
+import uuid
+from decimal import Decimal
+
+from src.api.response_models.dish_response import DishResponse
+from src.api.response_models.menu_response import MenuInfResponse, MenuSummaryResponse
+from src.db.models import Dish, Menu, Submenu
+from src.services import cache_codec
+
+
+def test_encode_decode_response_list() -> None:
+    menus = [
+        MenuInfResponse(
+            id=uuid.uuid4(),
+            title='Menu',
+            description='Menu description',
+            submenus_count=2,
+            dishes_count=5,
+        )
+    ]
+    decoded = cache_codec.decode(cache_codec.encode(menus))
+    assert decoded == menus, f'Expected {menus} got {decoded} instead'
+
+
+def test_encode_orm_tree_as_response_model() -> None:
+    menu = Menu(id=uuid.uuid4(), title='Menu', description='Menu description')
+    submenu = Submenu(
+        id=uuid.uuid4(), title='Submenu', description='Submenu description'
+    )
+    submenu.dishes = [
+        Dish(
+            id=uuid.uuid4(),
+            title='Dish',
+            description='Dish description',
+            price=Decimal('12.50'),
+        )
+    ]
+    menu.submenus = [submenu]
+    decoded = cache_codec.decode(
+        cache_codec.encode([menu], MenuSummaryResponse)
+    )
+    assert decoded == [MenuSummaryResponse.from_orm(menu)], 'Unexpected tree'
+    assert decoded[0].submenus[0].dishes[0].price == Decimal('12.50')
+
+
+def test_unknown_schema_version_is_miss() -> None:
+    dish = DishResponse(
+        id=uuid.uuid4(),
+        title='Dish',
+        description='Dish description',
+        price=Decimal('1.00'),
+        submenu_id=uuid.uuid4(),
+    )
+    raw_value = bytearray(cache_codec.encode(dish))
+    raw_value[0] = cache_codec.SCHEMA_VERSION + 1
+    assert cache_codec.decode(bytes(raw_value)) is None
+
+
+def test_encode_decode_not_found() -> None:
+    not_found = cache_codec.NotFound('menu not found')
+    decoded = cache_codec.decode(cache_codec.encode(not_found))
+    assert decoded == not_found, f'Expected {not_found} got {decoded} instead'
+
+
+def test_large_payload_is_compressed() -> None:
+    dishes = [
+        DishResponse(
+            id=uuid.uuid4(),
+            title=f'Dish {number}',
+            description='Dish description',
+            price=Decimal('1.00'),
+            submenu_id=uuid.uuid4(),
+        )
+        for number in range(100)
+    ]
+    raw_value = cache_codec.encode(dishes, compression_threshold=1024)
+    assert raw_value[2] & cache_codec.COMPRESSED, 'Payload is not compressed'
+    assert len(raw_value) < len(cache_codec.encode(dishes))
+    decoded = cache_codec.decode(raw_value)
+    assert decoded == dishes, f'Expected {dishes} got {decoded} instead'
+
+
+def test_encode_decode_response() -> None:
+    response = cache_codec.CachedResponse(
+        200, [('content-type', 'application/json')], b'{"id":"1"}' * 200
+    )
+    raw_value = cache_codec.encode(response, compression_threshold=1024)
+    decoded = cache_codec.decode(raw_value)
+    assert decoded == response, f'Expected {response} got {decoded} instead'
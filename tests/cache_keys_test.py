@@ -0,0 +1,62 @@
+from redis.crc import key_slot
+
+from src.services.cache_keys import (
+    DISHES_PAGE_KEY_TEMPLATE,
+    LIST_MENUS_KEY,
+    LIST_MENUS_PAGE_KEY_TEMPLATE,
+    dish_key,
+    dishes_list_key,
+    key_family,
+    key_tags,
+    lock_key,
+    menu_key,
+    menu_tree_key,
+    pages_tag,
+    parse_key,
+    submenu_key,
+    submenus_list_key,
+    tag_set_key,
+)
+
+PREFIX = 'resto:1:1:'
+
+
+def test_menu_subtree_keys_share_cluster_slot() -> None:
+    keys = [
+        menu_key('m'),
+        submenu_key('m', 's'),
+        dish_key('m', 's', 'd'),
+        menu_tree_key('m'),
+        submenus_list_key('m'),
+        dishes_list_key('m', 's'),
+    ]
+    keys += [tag_set_key(tag) for tag in key_tags(dish_key('m', 's', 'd'))]
+    keys.append(lock_key(menu_key('m')))
+    slots = {key_slot(f'{PREFIX}{key}'.encode()) for key in keys}
+    assert slots == {key_slot(b'm')}
+    assert key_slot(PREFIX.encode() + menu_key('n').encode()) != slots.pop()
+
+
+def test_ids_are_parsed_from_hash_tagged_keys() -> None:
+    assert parse_key(dish_key('m', 's', 'd')) == ('m', 's')
+    assert parse_key(dishes_list_key('m', 's')) == ('m', 's')
+    assert parse_key(submenus_list_key('m')) == ('m', None)
+
+
+def test_pages_are_tagged_with_their_list() -> None:
+    menus_page = LIST_MENUS_PAGE_KEY_TEMPLATE.format(limit=10, cursor='start')
+    dishes_page = DISHES_PAGE_KEY_TEMPLATE.format(
+        menu_id='m', submenu_id='s', limit=10, cursor='d'
+    )
+    assert key_family(menus_page) == 'list_menus_page'
+    assert key_family(dishes_page) == 'dishes_page'
+    assert key_tags(menus_page) == [pages_tag(LIST_MENUS_KEY)]
+    assert key_tags(dishes_page) == [
+        menu_key('m'),
+        submenu_key('m', 's'),
+        pages_tag(dishes_list_key('m', 's')),
+    ]
+    tag_set = tag_set_key(pages_tag(LIST_MENUS_KEY))
+    assert key_slot(f'{PREFIX}{menus_page}'.encode()) == key_slot(
+        f'{PREFIX}{tag_set}'.encode()
+    )
@@ -0,0 +1,53 @@
+from collections.abc import Iterator
+
+import pytest
+
+from src.core.settings import settings
+from src.services.cache_keys import dish_key, dishes_list_key
+from src.services.cache_policies import get_cache_policies, policy_for_key
+
+
+@pytest.fixture(autouse=True)
+def parse_policies_again() -> Iterator[None]:
+    """Policies are parsed once, tests change settings they come from."""
+    get_cache_policies.cache_clear()
+    yield
+    get_cache_policies.cache_clear()
+
+
+def test_policy_keys_match_key_helpers() -> None:
+    policies = get_cache_policies()
+    ids = {'menu_id': 'm', 'submenu_id': 's', 'dish_id': 'd'}
+    assert policies['dish'].key(**ids) == dish_key('m', 's', 'd')
+    assert policies['dishes_list'].key(**ids) == dishes_list_key('m', 's')
+    assert policy_for_key(policies, dish_key('m', 's', 'd')) == (
+        policies['dish']
+    )
+
+
+def test_settings_override_lifetimes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        settings,
+        'CACHE_POLICIES',
+        {'dishes_list': {'lifetime': 60, 'soft_lifetime': 30}},
+    )
+    policies = get_cache_policies()
+    assert policies['dishes_list'].lifetime == 60
+    assert policies['dishes_list'].soft_lifetime == 30
+    assert policies['dish'].lifetime == settings.REDIS_CACHE_LIFETIME
+
+
+@pytest.mark.parametrize(
+    'overrides',
+    [
+        {'unknown': {'lifetime': 60}},
+        {'dish': {'ttl': 60}},
+        {'dish': {'lifetime': 60, 'soft_lifetime': 60}},
+    ],
+)
+def test_invalid_overrides_are_rejected(
+    monkeypatch: pytest.MonkeyPatch, overrides: dict
+) -> None:
+    monkeypatch.setattr(settings, 'CACHE_POLICIES', overrides)
+    with pytest.raises(ValueError):
+        get_cache_policies()
@@ -0,0 +1,47 @@
+import asyncio
+
+from src.services.cache_rebuilder import CacheRebuilder
+
+
+async def test_burst_of_writes_is_rebuilt_once() -> None:
+    rebuilds = []
+
+    async def rebuild(keys: set[str]) -> None:
+        rebuilds.append(keys)
+
+    rebuilder = CacheRebuilder(delay=0.02, max_delay=1)
+    rebuilder.start(rebuild)
+    for key in ('a', 'b', 'a', 'c'):
+        rebuilder.schedule([key])
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.05)
+    assert rebuilds == [{'a', 'b', 'c'}]
+
+
+async def test_continuous_writes_are_rebuilt_after_max_delay() -> None:
+    rebuilds = []
+
+    async def rebuild(keys: set[str]) -> None:
+        rebuilds.append(keys)
+
+    rebuilder = CacheRebuilder(delay=0.02, max_delay=0.05)
+    rebuilder.start(rebuild)
+    for _ in range(10):
+        rebuilder.schedule(['a'])
+        await asyncio.sleep(0.01)
+    await rebuilder.stop()
+    assert rebuilds
+
+
+async def test_stop_returns_keys_not_rebuilt() -> None:
+    rebuilds = []
+
+    async def rebuild(keys: set[str]) -> None:
+        rebuilds.append(keys)
+
+    rebuilder = CacheRebuilder(delay=0.02, max_delay=1)
+    rebuilder.start(rebuild)
+    rebuilder.schedule(['a'])
+    assert await rebuilder.stop() == ['a']
+    assert not rebuilder.running
+    assert rebuilds == []
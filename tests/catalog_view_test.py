@@ -0,0 +1,115 @@
+from decimal import Decimal
+
+import pytest
+from faker import Faker
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.response_models.menu_response import MenuSummaryResponse
+from src.core.settings import settings
+from src.db.models import Dish, Menu, Submenu
+from src.repositories.menus_repository import MenuRepository
+from src.repositories.submenus_repository import SubmenuRepository
+from src.services import cache_service
+from src.services.cache_rebuilder import CacheRebuilder
+from src.services.cache_keys import (
+    LIST_MENUS_KEY,
+    dishes_list_key,
+    submenus_list_key,
+)
+from src.tasks.catalog_view import _stale_keys
+
+fake = Faker()
+
+
+def sorted_by_id(items: list) -> list:
+    return sorted(items, key=lambda item: str(item.id))
+
+
+async def read_catalog(
+    session: AsyncSession, menu_id
+) -> tuple[list, list, list[dict]]:
+    """Read menus, submenus of the menu and its tree, in stable order."""
+    menus = await MenuRepository(session).get_list_of_menus_db()
+    submenus = await SubmenuRepository(session).get_list_of_submenus_db(
+        menu_id
+    )
+    trees = [
+        MenuSummaryResponse.from_orm(menu)
+        for menu in await MenuRepository(session).get_full_menus_info_db(
+            [menu_id]
+        )
+    ]
+    for tree in trees:
+        tree.submenus = sorted_by_id(tree.submenus)
+    return sorted_by_id(menus), sorted_by_id(submenus), [
+        tree.dict() for tree in trees
+    ]
+
+
+async def test_reads_from_view_match_tables(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    menu = Menu(title=fake.sentence(), description=fake.sentence())
+    submenu = Submenu(
+        title=fake.sentence(), description=fake.sentence(), menu=menu
+    )
+    submenu.dishes = [
+        Dish(
+            title=fake.sentence(),
+            description=fake.sentence(),
+            price=Decimal('2.50'),
+        )
+    ]
+    empty_submenu = Submenu(
+        title=fake.sentence(), description=fake.sentence(), menu=menu
+    )
+    session.add_all([menu, empty_submenu])
+    await session.commit()
+    expected = await read_catalog(session, menu.id)
+
+    await MenuRepository(session).refresh_catalog_view_db()
+    monkeypatch.setattr(settings, 'CATALOG_VIEW_ENABLED', True)
+
+    assert await read_catalog(session, menu.id) == expected
+
+
+def test_lists_with_counts_are_refreshed_with_the_view() -> None:
+    assert _stale_keys({dishes_list_key('m', 's')}) == {
+        dishes_list_key('m', 's'),
+        submenus_list_key('m'),
+        LIST_MENUS_KEY,
+    }
+
+
+async def test_dish_list_does_not_wait_for_the_view(
+    ac: AsyncClient,
+    menu_data: dict,
+    dish_data: dict,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    async def refresh(keys: set[str]) -> None:
+        pass
+
+    refresher = CacheRebuilder(delay=60, max_delay=60)
+    refresher.start(refresh)
+    monkeypatch.setattr(cache_service, 'catalog_view_refresher', refresher)
+    monkeypatch.setattr(settings, 'CATALOG_VIEW_ENABLED', True)
+    menu = (await ac.post('/api/v1/menus/', json=menu_data)).json()
+    submenu = (
+        await ac.post(f"/api/v1/menus/{menu['id']}/submenus/", json=menu_data)
+    ).json()
+    dishes_url = (
+        f"/api/v1/menus/{menu['id']}/submenus/{submenu['id']}/dishes/"
+    )
+    assert (await ac.get(dishes_url)).json() == []
+
+    dish = (await ac.post(dishes_url, json=dish_data)).json()
+
+    assert [item['id'] for item in (await ac.get(dishes_url)).json()] == [
+        dish['id']
+    ]
+    pending = await refresher.stop()
+    assert LIST_MENUS_KEY in pending
+    assert dishes_list_key(menu['id'], submenu['id']) not in pending
+    await ac.delete(f"/api/v1/menus/{menu['id']}")
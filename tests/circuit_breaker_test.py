@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.services.cache_backends import (
+    CacheUnavailableError,
+    CircuitBreakerBackend,
+    MemoryCacheBackend,
+    circuit_breaker,
+)
+
+
+class FlakyBackend(MemoryCacheBackend):
+    failing = False
+
+    async def get(self, key: str) -> bytes | None:
+        if self.failing:
+            raise ConnectionError('Redis is down')
+        return await super().get(key)
+
+    async def set_many(self, *args) -> None:
+        if self.failing:
+            raise ConnectionError('Redis is down')
+        await super().set_many(*args)
+
+
+def make_breaker() -> tuple[CircuitBreakerBackend, FlakyBackend]:
+    backend = FlakyBackend(max_entries=10, max_bytes=1024)
+    breaker = CircuitBreakerBackend(
+        backend, timeout=0.05, failure_threshold=2, recovery_timeout=0.05
+    )
+    return breaker, backend
+
+
+async def test_circuit_opens_after_failures_and_recovers() -> None:
+    breaker, backend = make_breaker()
+    backend.failing = True
+    for _ in range(2):
+        with pytest.raises(CacheUnavailableError):
+            await breaker.get('a')
+    assert not breaker.available
+    backend.failing = False
+    with pytest.raises(CacheUnavailableError):
+        await breaker.get('a')
+    await asyncio.sleep(0.05)
+    assert await breaker.get('a') is None
+    assert breaker.state == 'closed'
+
+
+async def test_lost_fill_keeps_cache() -> None:
+    breaker, backend = make_breaker()
+    await breaker.set_many({'a': b'1'}, 60, {}, 60)
+    backend.failing = True
+    with pytest.raises(CacheUnavailableError):
+        await breaker.set_many({'a': b'2'}, 60, {}, 60)
+    backend.failing = False
+    assert await breaker.get('a') == b'1'
+
+
+async def test_lost_invalidation_is_retried_while_circuit_is_closed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    breaker, backend = make_breaker()
+    await breaker.set_many({'a': b'1', 'b': b'1'}, 60, {'a': ['m']}, 60)
+    delete, invalidate_tag = backend.delete, backend.invalidate_tag
+
+    async def failing(*args) -> None:
+        raise ConnectionError('Redis is down')
+
+    monkeypatch.setattr(backend, 'delete', failing)
+    monkeypatch.setattr(backend, 'invalidate_tag', failing)
+    with pytest.raises(CacheUnavailableError):
+        await breaker.delete(['b'])
+    monkeypatch.setattr(backend, 'delete', delete)
+    assert await breaker.mget(['a', 'b']) == [b'1', None]
+    with pytest.raises(CacheUnavailableError):
+        await breaker.invalidate_tag('m')
+    monkeypatch.setattr(backend, 'invalidate_tag', invalidate_tag)
+    assert breaker.state == 'closed'
+    assert await breaker.mget(['a', 'b']) == [None, None]
+
+
+async def test_namespace_is_flushed_after_recovery_if_many_writes_lost(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(circuit_breaker, 'LOST_WRITES_LIMIT', 1)
+    breaker, backend = make_breaker()
+    await breaker.set_many({'a': b'1'}, 60, {}, 60)
+    backend.failing = True
+    for _ in range(2):
+        with pytest.raises(CacheUnavailableError):
+            await breaker.get('a')
+    for key in ('b', 'c'):
+        with pytest.raises(CacheUnavailableError):
+            await breaker.delete([key])
+    backend.failing = False
+    await asyncio.sleep(0.05)
+    assert await breaker.get('a') == b'1'
+    assert breaker._flush_task is not None
+    await breaker._flush_task
+    assert await breaker.get('a') is None
+
+
+async def test_slow_call_times_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    breaker, backend = make_breaker()
+
+    async def slow_get(key: str) -> bytes | None:
+        await asyncio.sleep(1)
+        return None
+
+    monkeypatch.setattr(backend, 'get', slow_get)
+    with pytest.raises(CacheUnavailableError):
+        await breaker.get('a')
+    assert breaker.failures == 1
+
+
+async def test_invalidation_has_no_call_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    breaker, backend = make_breaker()
+
+    async def slow_invalidate_tag(tag: str) -> list[str]:
+        await asyncio.sleep(0.1)
+        return ['a']
+
+    monkeypatch.setattr(backend, 'invalidate_tag', slow_invalidate_tag)
+    assert await breaker.invalidate_tag('m') == ['a']
+    assert breaker.failures == 0
@@ -14,6 +14,7 @@ from run import app
 from src.core.settings import Settings, get_settings, settings
 from src.db.db import get_session
 from src.db.models import Base
+from src.services.cache_service import CacheService
 
 sys.path.append(os.path.join(os.getcwd(), 'src'))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -37,6 +38,8 @@ app.dependency_overrides[get_session] = override_get_async_session
 async def prepare_database() -> AsyncGenerator:
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # The cache outlives the application, drop entries of previous runs.
+    await CacheService().flush_cache()
     yield
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
@@ -57,6 +60,12 @@ def event_loop(request) -> Generator[AbstractEventLoop, None, None]:
     loop.close()
 
 
+@pytest.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_maker() as session:
+        yield session
+
+
 @pytest.fixture(scope='session')
 def app_settings() -> Settings:
     return get_settings()
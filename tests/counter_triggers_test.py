@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from faker import Faker
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import Dish, Menu, Submenu
+from src.repositories.menus_repository import MenuRepository
+
+fake = Faker()
+
+
+async def create_menu_with_dishes(
+    session: AsyncSession, dishes: int
+) -> tuple[Menu, Submenu]:
+    menu = Menu(title=fake.sentence(), description=fake.sentence())
+    submenu = Submenu(
+        title=fake.sentence(), description=fake.sentence(), menu=menu
+    )
+    submenu.dishes = [
+        Dish(
+            title=fake.sentence(),
+            description=fake.sentence(),
+            price=Decimal('1.50'),
+        )
+        for _ in range(dishes)
+    ]
+    session.add(menu)
+    await session.commit()
+    return menu, submenu
+
+
+async def test_triggers_count_submenus_and_dishes(
+    session: AsyncSession,
+) -> None:
+    menu, submenu = await create_menu_with_dishes(session, 3)
+    repository = MenuRepository(session)
+    menu_info = await repository.get_menu_db_with_counts(menu.id)
+    assert (menu_info.submenus_count, menu_info.dishes_count) == (1, 3)
+
+    submenu.dishes.pop(0)
+    await session.commit()
+    menu_info = await repository.get_menu_db_with_counts(menu.id)
+    assert (menu_info.submenus_count, menu_info.dishes_count) == (1, 2)
+
+    await session.delete(submenu)
+    await session.commit()
+    menu_info = await repository.get_menu_db_with_counts(menu.id)
+    assert (menu_info.submenus_count, menu_info.dishes_count) == (0, 0)
+
+
+async def test_reconcile_fixes_drifted_counts(session: AsyncSession) -> None:
+    menu, submenu = await create_menu_with_dishes(session, 2)
+    await session.execute(
+        update(Menu).where(Menu.id == menu.id).values(dishes_count=10)
+    )
+    await session.execute(
+        update(Submenu).where(Submenu.id == submenu.id).values(dishes_count=10)
+    )
+    await session.commit()
+
+    repository = MenuRepository(session)
+    assert await repository.reconcile_counts_db() == 2
+    menu_info = await repository.get_menu_db_with_counts(menu.id)
+    assert menu_info.dishes_count == 2
+
+
+async def test_cached_counts_follow_writes(
+    ac: AsyncClient, menu_data: dict, dish_data: dict
+) -> None:
+    menu = (await ac.post('/api/v1/menus/', json=menu_data)).json()
+    menu_url = f"/api/v1/menus/{menu['id']}"
+    responses = [
+        await ac.post(
+            f'{menu_url}/submenus/',
+            json={**menu_data, 'title': fake.sentence()},
+        )
+        for _ in range(2)
+    ]
+    assert [response.status_code for response in responses] == [201, 201]
+    submenu, other_submenu = [response.json() for response in responses]
+    submenu_url = f"{menu_url}/submenus/{submenu['id']}"
+    dish = (await ac.post(f'{submenu_url}/dishes/', json=dish_data)).json()
+    assert (await ac.get(menu_url)).json()['dishes_count'] == 1
+    assert (await ac.get(submenu_url)).json()['dishes_count'] == 1
+
+    # Dish is deleted through the URL of a submenu it does not belong to.
+    await ac.delete(
+        f"{menu_url}/submenus/{other_submenu['id']}/dishes/{dish['id']}"
+    )
+
+    menu_info = (await ac.get(menu_url)).json()
+    assert (menu_info['submenus_count'], menu_info['dishes_count']) == (2, 0)
+    assert (await ac.get(submenu_url)).json()['dishes_count'] == 0
+    [listed_menu] = [
+        item
+        for item in (await ac.get('/api/v1/menus/')).json()
+        if item['id'] == menu['id']
+    ]
+    assert listed_menu['dishes_count'] == 0
@@ -0,0 +1,56 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.cache_backends import MemoryCacheBackend, memory_backend
+
+
+async def test_values_expire_and_are_evicted(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    backend = MemoryCacheBackend(max_entries=2, max_bytes=1024)
+    await backend.set_many({'a': b'1', 'b': b'2'}, 60, {}, 60)
+    await backend.get('a')
+    await backend.set_many({'c': b'3'}, 60, {}, 60)
+    assert await backend.mget(['a', 'b', 'c']) == [b'1', None, b'3']
+    await backend.set_many({'d': b'4'}, 1, {}, 60)
+    now = time.monotonic()
+    monkeypatch.setattr(
+        memory_backend, 'time', SimpleNamespace(monotonic=lambda: now + 2)
+    )
+    assert await backend.get('d') is None
+
+
+async def test_invalidate_tag() -> None:
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=1024)
+    await backend.set_many(
+        {'menu': b'1', 'submenu': b'2', 'other': b'3'},
+        60,
+        {'menu': ['m'], 'submenu': ['m', 's']},
+        60,
+    )
+    assert sorted(await backend.invalidate_tag('m')) == ['menu', 'submenu']
+    assert await backend.mget(['menu', 'submenu', 'other']) == [
+        None,
+        None,
+        b'3',
+    ]
+
+
+async def test_rejected_value_leaves_no_tags() -> None:
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=4)
+    await backend.set_many({'menu': b'too large'}, 60, {'menu': ['m']}, 60)
+    assert await backend.invalidate_tag('m') == []
+
+
+async def test_generations_are_bounded_with_values() -> None:
+    backend = MemoryCacheBackend(max_entries=2, max_bytes=1024)
+    await backend.set_many({'menu@1': b'1'}, 60, {}, 60)
+    for key in ('gen:a', 'gen:b', 'gen:c'):
+        await backend.incr(key)
+    assert await backend.mget(['gen:a', 'gen:c', 'menu@1']) == [
+        None,
+        b'1',
+        None,
+    ]
@@ -0,0 +1,54 @@
+from faker import Faker
+from httpx import AsyncClient
+
+from src.api.request_models.page_request import NEXT_CURSOR_HEADER
+
+fake = Faker()
+
+
+async def read_pages(ac: AsyncClient, url: str, limit: int) -> list[dict]:
+    """Read all items of the list page by page, following the cursors."""
+    items: list[dict] = []
+    params: dict = {'limit': limit}
+    while True:
+        response = await ac.get(url, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= limit
+        items += page
+        if NEXT_CURSOR_HEADER not in response.headers:
+            return items
+        params['cursor'] = response.headers[NEXT_CURSOR_HEADER]
+
+
+async def test_pages_cover_the_list(ac: AsyncClient, clear_db) -> None:
+    for _ in range(5):
+        await ac.post(
+            '/api/v1/menus/',
+            json={'title': fake.sentence(), 'description': fake.sentence()},
+        )
+    menus = (await ac.get('/api/v1/menus/')).json()
+
+    pages = await read_pages(ac, '/api/v1/menus/', 2)
+
+    assert pages == sorted(menus, key=lambda menu: menu['id'])
+
+
+async def test_page_is_updated_after_write(ac: AsyncClient, clear_db) -> None:
+    response = await ac.post(
+        '/api/v1/menus/',
+        json={'title': fake.sentence(), 'description': fake.sentence()},
+    )
+    url = f"/api/v1/menus/{response.json()['id']}/submenus/"
+    assert await read_pages(ac, url, 10) == []
+
+    await ac.post(
+        url, json={'title': fake.sentence(), 'description': fake.sentence()}
+    )
+
+    assert len(await read_pages(ac, url, 10)) == 1
+
+
+async def test_limit_above_maximum_is_rejected(ac: AsyncClient) -> None:
+    response = await ac.get('/api/v1/menus/', params={'limit': 10**6})
+    assert response.status_code == 422
@@ -0,0 +1,204 @@
+import inspect
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, AsyncGenerator
+
+import pytest
+from sqlalchemy import delete, event, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.settings import settings
+from src.db.models import Dish, Menu, Submenu
+from src.repositories.dishes_repository import DishRepository
+from src.repositories.menus_repository import MenuRepository
+from src.repositories.submenus_repository import SubmenuRepository
+from tests.conftest import async_session_maker, engine_test
+
+# Menus, submenus of a menu and dishes of a submenu. Reads of one menu or
+# submenu select a small part of the tables, so the planner takes an
+# index when there is one.
+MENUS, SUBMENUS, DISHES = 100, 20, 20
+# Tables growing with the catalog, which must not be read whole.
+LARGE_TABLES = {'submenus', 'dishes', 'catalog_view'}
+
+# Repository, method and its arguments, names of seeded ids or values.
+QUERIES = {
+    'menu_with_counts': (
+        MenuRepository,
+        'get_menu_db_with_counts',
+        ['menu_id'],
+    ),
+    'menus_page': (MenuRepository, 'get_list_of_menus_db', [10, 'menu_id']),
+    'submenu_with_count': (
+        SubmenuRepository,
+        'get_submenu_with_count_db',
+        ['submenu_id'],
+    ),
+    'submenus_list': (
+        SubmenuRepository,
+        'get_list_of_submenus_db',
+        ['menu_id'],
+    ),
+    'submenus_page': (
+        SubmenuRepository,
+        'get_list_of_submenus_db',
+        ['menu_id', 5, 'submenu_id'],
+    ),
+    'dish': (DishRepository, 'get_dish_db', ['dish_id']),
+    'dishes_list': (
+        DishRepository,
+        'get_list_of_dishes_db',
+        ['menu_id', 'submenu_id'],
+    ),
+    'dishes_page': (
+        DishRepository,
+        'get_list_of_dishes_db',
+        ['menu_id', 'submenu_id', 5, 'dish_id'],
+    ),
+    'menu_tree': (MenuRepository, 'get_full_menus_info_db', [['menu_id']]),
+    'menus_json': (MenuRepository, 'stream_full_menus_json_db', []),
+}
+
+
+def resolve(arg: Any, ids: dict[str, uuid.UUID]) -> Any:
+    """Replace names of seeded ids with the ids."""
+    if isinstance(arg, list):
+        return [resolve(item, ids) for item in arg]
+    return ids.get(arg, arg) if isinstance(arg, str) else arg
+
+
+async def run_query(
+    session: AsyncSession, name: str, ids: dict[str, uuid.UUID]
+) -> None:
+    repository, method, args = QUERIES[name]
+    result = getattr(repository(session), method)(*resolve(args, ids))
+    if inspect.isasyncgen(result):
+        async for _ in result:
+            pass
+    else:
+        await result
+
+
+@pytest.fixture(scope='module')
+async def catalog_ids() -> AsyncGenerator[dict[str, uuid.UUID], None]:
+    """
+    Fill the catalog and give ids of one menu, submenu and dish. Filled
+    rows are deleted after the module, other tests expect own data only.
+    """
+    menu_rows, submenu_rows, dish_rows = [], [], []
+    for _ in range(MENUS):
+        menu_id = uuid.uuid4()
+        menu_rows.append(
+            {
+                'id': menu_id,
+                'title': f'Plan menu {menu_id}',
+                'description': 'Menu',
+            }
+        )
+        for _ in range(SUBMENUS):
+            submenu_id = uuid.uuid4()
+            submenu_rows.append(
+                {
+                    'id': submenu_id,
+                    'title': f'Plan submenu {submenu_id}',
+                    'description': 'Submenu',
+                    'menu_id': menu_id,
+                }
+            )
+            dish_rows.extend(
+                {
+                    'id': uuid.uuid4(),
+                    'title': f'Plan dish {uuid.uuid4()}',
+                    'description': 'Dish',
+                    'price': Decimal('1.50'),
+                    'submenu_id': submenu_id,
+                }
+                for _ in range(DISHES)
+            )
+    async with async_session_maker() as session:
+        await session.execute(insert(Menu), menu_rows)
+        await session.execute(insert(Submenu), submenu_rows)
+        await session.execute(insert(Dish), dish_rows)
+        await session.commit()
+        await MenuRepository(session).refresh_catalog_view_db()
+    async with engine_test.begin() as conn:
+        await conn.execute(text('ANALYZE'))
+    yield {
+        'menu_id': menu_rows[0]['id'],
+        'submenu_id': submenu_rows[0]['id'],
+        'dish_id': dish_rows[0]['id'],
+    }
+    menu_ids = [row['id'] for row in menu_rows]
+    async with async_session_maker() as session:
+        await session.execute(
+            delete(Dish).where(
+                Dish.submenu_id.in_(
+                    select(Submenu.id).where(Submenu.menu_id.in_(menu_ids))
+                )
+            )
+        )
+        await session.execute(
+            delete(Submenu).where(Submenu.menu_id.in_(menu_ids))
+        )
+        await session.execute(delete(Menu).where(Menu.id.in_(menu_ids)))
+        await session.commit()
+        await MenuRepository(session).refresh_catalog_view_db()
+
+
+async def explain(
+    session: AsyncSession, name: str, ids: dict[str, uuid.UUID]
+) -> list[dict]:
+    """Run the query and get plans of all selects it sent."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, many) -> None:
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(engine_test.sync_engine, 'before_cursor_execute', capture)
+    try:
+        await run_query(session, name, ids)
+    finally:
+        event.remove(
+            engine_test.sync_engine, 'before_cursor_execute', capture
+        )
+    conn = await session.connection()
+    plans = []
+    for statement, parameters in statements:
+        result = await conn.exec_driver_sql(
+            f'EXPLAIN (FORMAT JSON) {statement}', parameters
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        plans.append(plan[0]['Plan'])
+    return plans
+
+
+def seq_scans(plan: dict) -> set[str]:
+    """Get relations read by sequential scans anywhere in the plan."""
+    relations = set()
+    if plan['Node Type'] == 'Seq Scan':
+        relations.add(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        relations |= seq_scans(child)
+    return relations
+
+
+@pytest.mark.parametrize('catalog_view_enabled', [False, True])
+@pytest.mark.parametrize('name', QUERIES)
+async def test_queries_use_indexes_on_large_tables(
+    name: str,
+    catalog_view_enabled: bool,
+    catalog_ids: dict[str, uuid.UUID],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        settings, 'CATALOG_VIEW_ENABLED', catalog_view_enabled
+    )
+    async with async_session_maker() as session:
+        plans = await explain(session, name, catalog_ids)
+    assert plans, f'{name} sent no selects'
+    for plan in plans:
+        assert not seq_scans(plan) & LARGE_TABLES, json.dumps(plan, indent=1)
@@ -0,0 +1,162 @@
+import uuid
+from typing import Any
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src import create_app
+from src.api.response_cache import ResponseCacheMiddleware
+from src.core.settings import settings
+from src.db.db import get_session
+from src.services import cache_backends
+from src.services.cache_backends import MemoryCacheBackend
+from src.services.cache_service import CacheService
+from tests.conftest import override_get_async_session
+
+
+def make_client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> tuple[AsyncClient, list[str]]:
+    monkeypatch.setattr(
+        cache_backends,
+        '_backend',
+        MemoryCacheBackend(max_entries=100, max_bytes=1024 * 1024),
+    )
+    app = FastAPI()
+    calls = []
+
+    @app.get('/api/v1/menus/{menu_id}')
+    async def get_menu(menu_id: str) -> dict[str, int]:
+        calls.append(menu_id)
+        return {'calls': len(calls)}
+
+    @app.patch('/api/v1/menus/{menu_id}')
+    async def update_menu(menu_id: str) -> dict:
+        return {}
+
+    @app.delete('/api/v1/cache/metrics')
+    async def reset_metrics() -> dict:
+        return {}
+
+    cached_app = ResponseCacheMiddleware(app, prefix='/api/v1/menus')
+    return AsyncClient(app=cached_app, base_url='http://test'), calls
+
+
+async def test_response_is_served_from_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, calls = make_client(monkeypatch)
+    menu_id = uuid.uuid4()
+    async with client:
+        first = await client.get(f'/api/v1/menus/{menu_id}')
+        second = await client.get(f'/api/v1/menus/{menu_id}')
+    assert second.json() == first.json()
+    assert second.headers['x-cache'] == 'HIT'
+    assert second.headers['content-type'] == 'application/json'
+    assert len(calls) == 1
+
+
+async def test_write_invalidates_responses_of_menu_only(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, calls = make_client(monkeypatch)
+    menu_id, other_menu_id = uuid.uuid4(), uuid.uuid4()
+    async with client:
+        await client.get(f'/api/v1/menus/{menu_id}')
+        await client.get(f'/api/v1/menus/{other_menu_id}')
+        await client.patch(f'/api/v1/menus/{menu_id}')
+        changed = await client.get(f'/api/v1/menus/{menu_id}')
+        other = await client.get(f'/api/v1/menus/{other_menu_id}')
+    assert 'x-cache' not in changed.headers
+    assert other.headers['x-cache'] == 'HIT'
+    assert len(calls) == 3
+
+
+async def test_write_outside_of_data_keeps_responses(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client, calls = make_client(monkeypatch)
+    menu_id = uuid.uuid4()
+    async with client:
+        await client.get(f'/api/v1/menus/{menu_id}')
+        await client.delete('/api/v1/cache/metrics')
+        response = await client.get(f'/api/v1/menus/{menu_id}')
+    assert response.headers['x-cache'] == 'HIT'
+    assert len(calls) == 1
+
+
+def make_app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    monkeypatch.setattr(settings, 'CACHE_RESPONSES_ENABLED', True)
+    app = create_app()
+    app.dependency_overrides[get_session] = override_get_async_session
+    return app
+
+
+async def test_response_cached_before_background_refresh_is_dropped(
+    monkeypatch: pytest.MonkeyPatch, menu_data: dict
+) -> None:
+    app = make_app(monkeypatch)
+    refresh_dependents = CacheService.refresh_dependents
+    stale_reads = []
+
+    async def read_then_refresh(
+        self: CacheService, policy: str, **ids: Any
+    ) -> None:
+        # Request served after the write, before its background tasks.
+        stale_reads.append(await client.get('/api/v1/menus/'))
+        await refresh_dependents(self, policy, **ids)
+
+    async with AsyncClient(app=app, base_url='http://tests') as client:
+        menu = (await client.post('/api/v1/menus/', json=menu_data)).json()
+        await client.get('/api/v1/menus/')
+        monkeypatch.setattr(
+            CacheService, 'refresh_dependents', read_then_refresh
+        )
+        await client.patch(
+            f"/api/v1/menus/{menu['id']}",
+            json={'title': 'Updated title', 'description': 'Updated'},
+        )
+        monkeypatch.setattr(
+            CacheService, 'refresh_dependents', refresh_dependents
+        )
+        response = await client.get('/api/v1/menus/')
+        await client.delete(f"/api/v1/menus/{menu['id']}")
+    assert stale_reads
+    assert 'x-cache' not in response.headers
+    titles = {item['id']: item['title'] for item in response.json()}
+    assert titles[menu['id']] == 'Updated title'
+
+
+async def test_write_through_other_menu_drops_responses_of_owner(
+    monkeypatch: pytest.MonkeyPatch, menu_data: dict
+) -> None:
+    app = make_app(monkeypatch)
+    async with AsyncClient(app=app, base_url='http://tests') as client:
+        menu, other_menu = [
+            (
+                await client.post(
+                    '/api/v1/menus/',
+                    json={**menu_data, 'title': f'Menu {uuid.uuid4()}'},
+                )
+            ).json()
+            for _ in range(2)
+        ]
+        submenu = (
+            await client.post(
+                f"/api/v1/menus/{menu['id']}/submenus/", json=menu_data
+            )
+        ).json()
+        url = f"/api/v1/menus/{menu['id']}/submenus/{submenu['id']}"
+        await client.get(url)
+        assert (await client.get(url)).headers['x-cache'] == 'HIT'
+        # Submenu is updated through the URL of a menu it does not belong to.
+        await client.patch(
+            f"/api/v1/menus/{other_menu['id']}/submenus/{submenu['id']}",
+            json={'title': 'Updated title', 'description': 'Updated'},
+        )
+        response = await client.get(url)
+        for deleted_menu in (menu, other_menu):
+            await client.delete(f"/api/v1/menus/{deleted_menu['id']}")
+    assert 'x-cache' not in response.headers
+    assert response.json()['title'] == 'Updated title'